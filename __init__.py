@@ -23,14 +23,30 @@
 __docformat__ = "restructuredText"
 
 from .about import __version__
-from .pyconf import get_py_config
+from .pyconf import get_py_config, get_py_configs
+from .multimod import multi_init_c_source, facade_py_source, shim_py_source
+from .swigdeps import parse_depfile, load_dep_db, update_dep_db
+from .pkgindex import find_swig_modules
+from .modbench import bench_module, load_results, save_results, regressions
+from .buildprof import get_profile, add_record, measured_spawn, now, thread_cpu_time
+from .compcache import watch as watch_compiler_cache
 
 import os
+import re
 import sys
+import hashlib
+import shutil
+import subprocess
+import SCons.Action
 import SCons.Builder
 import SCons.Tool
 import SCons.Util
 import SCons.Defaults
+import SCons.Errors
+import SCons.Node.Python
+import SCons.Platform.posix
+import SCons.Scanner
+import SCons.Subst
 
 try:
     import site_tools.swig as swig_tool
@@ -101,16 +117,463 @@ swigPyVars = [
 swigPyReplacements = Replacements({k: 'SWIGPY_%s' % k for k in swigPyVars})
 
 
-class SwigPyShlibBuilder(ReplacingBuilder):
+def _lib_affixes(env):
+    # Preserve original $LIBPREFIXES and $LIBSUFFIXES
+    return {'LIBPREFIXES': [env.subst(x) for x in env['LIBPREFIXES']],
+            'LIBSUFFIXES': [env.subst(x) for x in env['LIBSUFFIXES']]}
+
+
+_feature_flags = ('SWIGFLAGS', 'CCFLAGS', 'CXXFLAGS', 'LINKFLAGS')
+
+
+def _SwigPyFeatureOverride(env):
+    # Appends the flags of swigpy features ($_SWIGPY_SWIGFLAGS and alike) to
+    # the ones used by the commands. This is done in the environment of each
+    # call, after SWIGPY_SWIGFLAGS and alike are replaced, so that overriding
+    # them doesn't drop the features. Py_LIMITED_API is defined here for the
+    # same reason.
+    ovr = dict((k, ['$' + k, '$_SWIGPY_' + k]) for k in _feature_flags)
+    limited_api = env.get('SWIGPY_LIMITED_API')
+    if limited_api:
+        ovr['SWIGFLAGS'] = ['$_SWIGPY_LIMITEDAPISWIGFLAGS', '$_SWIGPY_SWIGFLAGS']
+        ovr['_SWIGPY_USERSWIGFLAGS'] = env.get('SWIGFLAGS', [])
+        ovr['CPPDEFINES'] = _limited_api_defines(env.get('CPPDEFINES', []), limited_api)
+    return env.Override(ovr)
+
+
+_builder_kw = ('chdir', 'srcdir')
+
+
+class SwigPyBuilder(ReplacingBuilder):
+    def apply_replacements(self, env, **kw):
+        (env, kw) = ReplacingBuilder.apply_replacements(self, env, **kw)
+        # chdir and srcdir are handled by the builder, not by env
+        builder_kw = dict((k, kw.pop(k)) for k in _builder_kw if k in kw)
+        return (_SwigPyFeatureOverride(env.Override(kw)), builder_kw)
+
+
+class SwigPyShlibBuilder(SwigPyBuilder):
     def __call__(self, env, target, source, *args, **kw):
-        # Preserve original $LIBPREFIXES and $LIBSUFFIXES
-        ovr = {'LIBPREFIXES': [env.subst(x) for x in env['LIBPREFIXES']],
-               'LIBSUFFIXES': [env.subst(x) for x in env['LIBSUFFIXES']]}
-        return ReplacingBuilder.__call__(self, env, target, source, *args, **dict(ovr, **kw))
+        ovr = _lib_affixes(env)
+        return SwigPyBuilder.__call__(self, env, target, source, *args, **dict(ovr, **kw))
 
 
-def _SwigPyModuleImpl(env, modname, **kw):
-    parts = modname.split('.')
+def _normalized_flags(flags):
+    # Groups options with their arguments and sorts the groups, dropping
+    # duplicates: ['-python', '-I', 'a', '-c++', '-python'] -> ['-I', 'a',
+    # '-c++', '-python'].
+    groups = []
+    for flag in flags:
+        if groups and not flag.startswith('-'):
+            groups[-1] += (flag,)
+        else:
+            groups.append((flag,))
+    return [flag for group in sorted(set(groups)) for flag in group]
+
+
+def _SwigPyNormalizedSwigFlags(target, source, env, for_signature):
+    # Stands for $SWIGFLAGS in signatures of normalized commands, such that
+    # reordering or repeating the flags doesn't trigger regeneration.
+    if not for_signature:
+        return []
+    flags = env.subst_list('$SWIGFLAGS', SCons.Subst.SUBST_SIG, target, source)[0]
+    return [flag.replace('$', '$$') for flag in _normalized_flags([str(f) for f in flags])]
+
+
+def _override_key(value):
+    # Hashable equivalent of keyword arguments of a builder call, values that
+    # can't be hashed are identified by their ids.
+    if SCons.Util.is_Dict(value):
+        return ('dict',) + tuple(sorted(((k, _override_key(v)) for (k, v) in value.items()),
+                                        key=lambda item: repr(item[0])))
+    if SCons.Util.is_Sequence(value):
+        return (type(value).__name__,) + tuple(_override_key(v) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        return ('id', id(value))
+    return value
+
+
+class _SwigPyBuilders(object):
+    # Calls builders of env, sharing override environments between calls
+    # with equal keyword arguments. SwigPyModule() creates one per call to
+    # register all its modules, env mustn't change meanwhile.
+    def __init__(self, env):
+        self.env = env
+        self._replaced = {}
+        self._overrides = {}
+
+    def Override(self, kw, replacements=None):
+        # With replacements, the environment is the one SwigPyBuilder would
+        # pass to the wrapped builder.
+        if replacements is None:
+            base = self.env
+        else:
+            try:
+                base = self._replaced[id(replacements)]
+            except KeyError:
+                base = self.env.Override(replacements.apply(self.env))
+                self._replaced[id(replacements)] = base
+            kw = replacements.apply(kw, True)
+        key = (id(base), _override_key(kw))
+        try:
+            return self._overrides[key][1]
+        except KeyError:
+            pass
+        oenv = base.Override(kw)
+        if replacements is not None:
+            oenv = _SwigPyFeatureOverride(oenv)
+        # kw is kept alive with oenv, as the key may refer to ids of its values
+        self._overrides[key] = (kw, oenv)
+        return oenv
+
+    def ReplacedOverride(self, name, kw):
+        return self.Override(kw, self.env['BUILDERS'][name].replacements)
+
+    def __getattr__(self, name):
+        def call(target=None, source=None, **kw):
+            builder = self.env['BUILDERS'][name]
+            if target is not None and not SCons.Util.is_List(target):
+                target = [target]
+            if source is not None and not SCons.Util.is_List(source):
+                source = [source]
+            # chdir and srcdir are handled by the builder, not by env
+            builder_kw = {k: kw.pop(k) for k in _builder_kw if k in kw}
+            if not isinstance(builder, ReplacingBuilder):
+                nodes = builder(self.Override(kw), target, source, **builder_kw)
+            else:
+                if isinstance(builder, SwigPyShlibBuilder):
+                    kw = dict(_lib_affixes(self.env), **kw)
+                nodes = builder.wrapped(self.Override(kw, builder.replacements), target, source, **builder_kw)
+            if name in _profile_phases and self.env.get('SWIGPY_PROFILE'):
+                _SwigPyProfileNodes(self.env, _profile_phases[name], nodes)
+            return nodes
+        return call
+
+
+_profile_phases = {
+    'SwigPyCFile': 'swig',
+    'SwigPyCXXFile': 'swig',
+    'SwigPyStaticObject': 'compile',
+    'SwigPySharedObject': 'compile',
+    'SwigPyShlib': 'link',
+}
+
+
+_posix_spawn = getattr(SCons.Platform.posix, 'subprocess_spawn', None)
+
+
+class _SwigPyProfiledAction(SCons.Action.ActionBase):
+    # Runs the wrapped action and records its timing in profile. Signatures
+    # are those of the wrapped action, so enabling the profile doesn't cause
+    # rebuilds.
+    def __init__(self, action, phase, profile):
+        self.action = action
+        self.phase = phase
+        self.profile = profile
+
+    def __getattr__(self, name):
+        if name == 'action':
+            raise AttributeError(name)
+        return getattr(self.action, name)
+
+    def __str__(self):
+        return str(self.action)
+
+    def genstring(self, target, source, env):
+        return self.action.genstring(target, source, env)
+
+    def get_contents(self, target, source, env):
+        return self.action.get_contents(target, source, env)
+
+    def get_varlist(self, target, source, env, executor=None):
+        return self.action.get_varlist(target, source, env, executor)
+
+    def get_targets(self, env, executor):
+        return self.action.get_targets(env, executor)
+
+    def presub_lines(self, env):
+        return self.action.presub_lines(env)
+
+    def batch_key(self, env, target, source):
+        return self.action.batch_key(env, target, source)
+
+    def __call__(self, target, source, env, *args, **kw):
+        executor = kw.get('executor')
+        if executor:
+            target = executor.get_all_targets()
+            source = executor.get_all_sources()
+        # Resource usage of commands is only known when they're run by us.
+        if hasattr(os, 'wait4') and env.get('SPAWN') is _posix_spawn:
+            usages = []
+            env = env.Override({'SPAWN': measured_spawn(usages)})
+        else:
+            usages = None
+        (start, cpu) = (now(), thread_cpu_time())
+        status = self.action(target, source, env, *args, **kw)
+        (end, cpu) = (now(), thread_cpu_time() - cpu)
+        add_record(self.profile, self.phase, [str(t) for t in target], [str(s) for s in source],
+                   start, end, cpu, usages)
+        return status
+
+
+def _SwigPyProfileNodes(env, phase, nodes):
+    profile = get_profile(env.File(env.subst('$SWIGPY_PROFILE')).get_abspath())
+    for node in nodes:
+        executor = node.get_executor()
+        actions = executor.action_list
+        if any(isinstance(a, _SwigPyProfiledAction) for a in actions):
+            continue
+        executor.set_action_list([_SwigPyProfiledAction(a, phase, profile) for a in actions])
+
+
+def _pch_header_source(headers):
+    lines = ['/* Generated by swigpy, do not edit. */', '#define PY_SSIZE_T_CLEAN']
+    for header in headers:
+        if header[:1] not in ('<', '"'):
+            header = '"%s"' % header
+        lines.append('#include %s' % header)
+    return '\n'.join(lines) + '\n'
+
+
+def _SwigPyPCH(env, builders, c_node, **kw):
+    # Returns the precompiled header to be used when compiling the wrapper
+    # c_node, and the overrides which make the compiler use it. The header is
+    # named after a hash of its compilation command, so that environments
+    # (and interpreters) differing in flags get their own header.
+    cxx = os.path.splitext(c_node.name)[1] in CXXSuffixes
+    headers = kw.get('SWIGPY_PCH', env.get('SWIGPY_PCH'))
+    headers = ['<Python.h>'] + (list(headers) if SCons.Util.is_List(headers) else [])
+    renv = builders.ReplacedOverride('SwigPyPCH', kw)
+    _gnu_cc_mode(renv, 'SWIGPY_PCH')
+    com = renv.subst('$SWIGPY_PCHCXXCOM' if cxx else '$SWIGPY_PCHCCCOM')
+    key = hashlib.md5('\n'.join([com] + headers).encode('utf-8')).hexdigest()[:12]
+    header = env.Dir(renv.subst('$SWIGPY_PCHDIR')).File('swigpy_pch_%s%s' % (key, '.hpp' if cxx else '.h'))
+    pch = header.dir.File(header.name + renv.subst('$SWIGPY_PCHSUFFIX'))
+    if not pch.has_builder():
+        builders.SwigPyPCHHeader(header, headers)
+        builders.SwigPyPCH(pch, header, **kw)
+    return (pch, dict(kw, _SWIGPY_PCHFLAGS=['-include', header, '-Winvalid-pch']))
+
+
+def _cc_name(env):
+    return os.path.splitext(os.path.basename(env.subst('$CC')))[0].lower()
+
+
+def _gnu_cc_mode(env, option):
+    cc = _cc_name(env)
+    if cc in ('cl', 'icl'):
+        raise SCons.Errors.UserError("%s is supported for GCC and Clang only" % option)
+    return 'clang' if 'clang' in cc else 'gcc'
+
+
+def _pgo_mode(env):
+    return _gnu_cc_mode(env, 'SWIGPY_PGO')
+
+
+def _SwigPyPGOTrainAction(target, source, env):
+    # Runs the training script against the instrumented extension and
+    # collects the profiles: the .gcda files (GCC) are copied next to the
+    # objects of the optimized build, the raw profiles (Clang) are written to
+    # a directory of the module and merged.
+    mode = env['_SWIGPY_PGOMODE']
+    root = env['_SWIGPY_PGOROOT']
+    rawdir = env['_SWIGPY_PGORAWDIR']
+    objs = [os.path.splitext(obj)[0] + '.gcda' for obj in env['_SWIGPY_PGOOBJS']]
+    if mode == 'gcc':
+        stale = objs
+    elif os.path.isdir(rawdir):
+        stale = [os.path.join(rawdir, f) for f in os.listdir(rawdir) if f.endswith('.profraw')]
+    else:
+        os.makedirs(rawdir)
+        stale = []
+    for f in stale:
+        if os.path.exists(f):
+            os.remove(f)
+    environ = dict((k, str(v)) for k, v in env['ENV'].items())
+    environ['PYTHONPATH'] = root
+    environ['LLVM_PROFILE_FILE'] = os.path.join(rawdir, 'swigpy-%p.profraw')
+    # Run the script from root, so that the directory of the script (which
+    # may contain same-named packages) does not shadow the extension.
+    runner = 'import runpy, sys; runpy.run_path(sys.argv[1], run_name="__main__")'
+    status = subprocess.call([env['_SWIGPY_PGOPYTHON'], '-c', runner, source[0].get_abspath()],
+                             env=environ, cwd=root)
+    if status != 0:
+        return status
+    if mode == 'gcc':
+        for obj, gcda in zip(objs, target):
+            if not os.path.exists(obj):
+                raise SCons.Errors.UserError("training with %s left no profile for %s"
+                                             % (source[0], gcda))
+            shutil.copyfile(obj, str(gcda))
+        return 0
+    raws = [os.path.join(rawdir, f) for f in os.listdir(rawdir) if f.endswith('.profraw')]
+    profdata = env.subst('$SWIGPY_LLVMPROFDATA')
+    return subprocess.call([profdata, 'merge', '-output=' + str(target[0])] + raws, env=environ)
+
+
+def _SwigPyPGO(env, builders, mode, c_nodes, obj_target, py_nodes, shlib_file, variant, script, **kw):
+    # Builds the instrumented extension in $SWIGPY_PGODIR (under variant) and
+    # trains it. Returns the profiles to be used by obj_target. The raw
+    # profiles of Clang go to a directory of the module, so that modules
+    # trained in parallel don't mix them up.
+    root = os.path.join(variant or '.', builders.Override(kw).subst('$SWIGPY_PGODIR'))
+    gen_kw = dict(kw, _SWIGPY_PGOFLAGS='$SWIGPY_PGOGENFLAGS_' + mode.upper())
+    here = env.Dir('.')
+    gen_objs = []
+    for c_node in c_nodes:
+        obj_file = os.path.join(root, os.path.splitext(here.rel_path(c_node))[0])
+        gen_objs += builders.SwigPySharedObject(obj_file, c_node, **gen_kw)
+    gen_shlib = builders.SwigPyShlib(os.path.join(root, shlib_file), gen_objs, **gen_kw)
+    copies = []
+    for py in py_nodes:
+        copies += env.Command(os.path.join(root, here.rel_path(py)), py,
+                              SCons.Defaults.Copy('$TARGET', '$SOURCE'))
+    if mode == 'gcc':
+        profiles = [os.path.splitext(str(obj))[0] + '.gcda' for obj in obj_target]
+    else:
+        profiles = [kw['_SWIGPY_PGOPROFILE']]
+    python = _which_python(env, kw.get('SWIGPY_PYTHON', env.get('SWIGPY_PYTHON'))) or sys.executable
+    root = env.Dir(root).get_abspath()
+    return builders.SwigPyPGOTrain(profiles, [script] + gen_shlib + gen_objs + copies,
+                                   _SWIGPY_PGOMODE=mode,
+                                   _SWIGPY_PGOROOT=root,
+                                   _SWIGPY_PGORAWDIR=os.path.join(root, shlib_file + '.profraw'),
+                                   _SWIGPY_PGOOBJS=[obj.get_abspath() for obj in gen_objs],
+                                   _SWIGPY_PGOPYTHON=python)
+
+
+def _SwigPyModuleShlib(env, builders, c_nodes, shlib_file, variant=None, py_nodes=(), **kw):
+    # Compile the (interpreter-independent) wrappers c_nodes and link them
+    # into shlib_file. If variant is given, the objects and the shared library
+    # go to that subdirectory.
+    pgo = kw.get('SWIGPY_PGO', env.get('SWIGPY_PGO'))
+    if pgo:
+        mode = _pgo_mode(builders.ReplacedOverride('SwigPySharedObject', kw))
+        profile = env.File(os.path.join(variant or '.', shlib_file) + '.profdata')
+        kw = dict(kw, _SWIGPY_PGOFLAGS='$SWIGPY_PGOUSEFLAGS_' + mode.upper(),
+                      _SWIGPY_PGOPROFILE=profile)
+    pch_enabled = kw.get('SWIGPY_PCH', env.get('SWIGPY_PCH'))
+    obj_target = []
+    for c_node in c_nodes:
+        if variant is None:
+            obj_file = None
+        else:
+            obj_file = os.path.join(variant, os.path.splitext(env.Dir('.').rel_path(c_node))[0])
+        if pch_enabled:
+            (pch, obj_kw) = _SwigPyPCH(env, builders, c_node, **kw)
+        else:
+            (pch, obj_kw) = (None, kw)
+        obj = builders.SwigPySharedObject(obj_file, c_node, **obj_kw)
+        if pch is not None:
+            env.Depends(obj, pch)
+        obj_target += obj
+    if pgo:
+        profiles = _SwigPyPGO(env, builders, mode, c_nodes, obj_target, py_nodes, shlib_file,
+                              variant, pgo, **kw)
+        env.Depends(obj_target, profiles)
+    if variant is not None:
+        shlib_file = os.path.join(variant, shlib_file)
+    return builders.SwigPyShlib(shlib_file, obj_target, **kw)
+
+
+def _swig_dep_key(node, path):
+    return os.pathsep.join([node.srcnode().get_abspath()] + [d.get_abspath() for d in path])
+
+
+def _SwigPyDepScan(node, env, path):
+    # Returns dependencies recorded by swig in the last build. Interface files
+    # not compiled so far are scanned (recursively) by the usual swig scanner.
+    depdb = env.get('_SWIGPY_SWIGDEPDB')
+    deps = load_dep_db(depdb).get(_swig_dep_key(node, path)) if depdb else None
+    if deps is None:
+        return node.get_implicit_deps(env, SCons.Tool.SWIGScanner, lambda scanner: path)
+    deps = [env.fs.File(dep) for dep in deps]
+    skip = (node, node.srcnode())
+    return [dep for dep in deps if dep not in skip and (dep.has_builder() or dep.exists())]
+
+
+SwigPyDepScanner = SCons.Scanner.Base(_SwigPyDepScan, name='SwigPyDepScanner',
+                                      skeys=SCons.Tool.SWIGSuffixes,
+                                      path_function=SCons.Scanner.FindPathDirs('SWIGPATH'))
+
+
+def _SwigPyDepDBAction(target, source, env):
+    depfile = str(target[0]) + '.d'
+    try:
+        with open(depfile) as f:
+            deps = parse_depfile(f.read())
+        os.remove(depfile)
+    except (IOError, OSError):
+        return 0
+    path = SwigPyDepScanner.path(env, target[0].cwd, target, source)
+    deps = [os.path.abspath(dep) for dep in deps]
+    update_dep_db(env['_SWIGPY_SWIGDEPDB'], _swig_dep_key(source[0], path), deps)
+    return 0
+
+
+SwigPyDepDBAction = SCons.Action.Action(_SwigPyDepDBAction, None)
+
+
+def _SwigPyDepDBOverrides(env, depdb, kw):
+    depdb = env.File(env.subst(depdb)).get_abspath()
+    return dict(kw, _SWIGPY_DEPDBFLAGS=['-MMD', '-MF', '${TARGET}.d'], _SWIGPY_SWIGDEPDB=depdb)
+
+
+def _SwigPyNoThreadFile(env, builders, module, c_file, swig_file, names, **kw):
+    # Generates an interface which declares %nothread for names and includes
+    # swig_file. It's named after the module, as SCons guesses module name
+    # from file name when %module can't be read.
+    target = os.path.join(os.path.dirname(c_file), builders.Override(kw).subst('$SWIGPY_NOTHREADDIR'),
+                          module + '.i')
+    target = env.File(target)
+    include = os.path.relpath(env.File(swig_file).srcnode().get_abspath(), target.dir.get_abspath())
+    return builders.SwigPyNoThreadFile(target, SCons.Util.flatten(names),
+                                       SWIGPY_NOTHREADINCLUDE=include.replace(os.sep, '/'))
+
+
+def _SwigPyWrapper(env, builders, module, c_file, swig_file, **kw):
+    nothread = kw.get('SWIGPY_NOTHREAD', env.get('SWIGPY_NOTHREAD'))
+    if nothread:
+        swig_file = _SwigPyNoThreadFile(env, builders, module, c_file, swig_file, nothread, **kw)
+    depdb = kw.get('SWIGPY_SWIGDEPDB', env.get('SWIGPY_SWIGDEPDB'))
+    if depdb:
+        kw = _SwigPyDepDBOverrides(env, depdb, kw)
+    if '-c++' in kw.get('SWIGFLAGS', env.get('SWIGFLAGS',[])):
+        wrapper = builders.SwigPyCXXFile(c_file, swig_file, **kw)
+    else:
+        wrapper = builders.SwigPyCFile(c_file, swig_file, **kw)
+    if depdb:
+        env.AddPostAction(wrapper[0], SwigPyDepDBAction)
+    return wrapper
+
+
+def _split_names(name, split):
+    if SCons.Util.is_List(split):
+        return list(split)
+    return ['%s_%d' % (name, i) for i in range(int(split))]
+
+
+def _SwigPySplitWrappers(env, builders, parts, split, m2swigfile, m2cfile, shlib_file, **kw):
+    # Generate wrappers for the sub-modules of the split module, plus the
+    # container init and the python facade for the whole module.
+    names = _split_names(parts[-1], split)
+    c_target = []
+    c_nodes = []
+    for name in names:
+        subparts = parts[:-1] + [name]
+        wrapper = _SwigPyWrapper(env, builders, name, m2cfile(subparts), m2swigfile(subparts), **kw)
+        c_target += wrapper
+        c_nodes += wrapper[:1]
+    container = builders.Override(kw).subst('$SWIGPY_SHLIBPREFIX') + os.path.basename(shlib_file)
+    init = builders.SwigPyInitFile(m2cfile(parts) + '_init', ['_' + name for name in names],
+                                   SWIGPY_INITMODULE=container)
+    facade = builders.SwigPyFacadeFile(m2cfile(parts), names, SWIGPY_INITMODULE=container)
+    return (c_target + init + facade, c_nodes + init)
+
+
+def _module_files(env, kw):
     m2swigfile  = kw.get('SWIGPY_M2SWIGFILE',
                   env.get('SWIGPY_M2SWIGFILE',
                   lambda parts: os.path.join(*parts) + '.i'))
@@ -120,21 +583,489 @@ def _SwigPyModuleImpl(env, modname, **kw):
     m2shlibfile = kw.get('SWIGPY_M2SHLIBFILE',
                   env.get('SWIGPY_M2SHLIBFILE',
                   lambda parts: os.path.join(*parts)))
+    return (m2swigfile, m2cfile, m2shlibfile)
+
+
+def _SwigPyModuleShlibs(env, builders, c_nodes, shlib_file, pyconfs=None, py_nodes=(), **kw):
+    if pyconfs is None:
+        return _SwigPyModuleShlib(env, builders, c_nodes, shlib_file, None, py_nodes, **kw)
+    shlib_target = []
+    for pyconf in pyconfs:
+        pykw = dict(kw, **pyconf)
+        variant = builders.Override(pykw).subst('$SWIGPY_PYTHONVARIANTDIR')
+        shlib_target += _SwigPyModuleShlib(env, builders, c_nodes, shlib_file, variant,
+                                           py_nodes, **pykw)
+    return shlib_target
+
+
+# Outputs of the modules built so far, keyed on the SConscript directory and
+# module name, for SwigPyBench().
+_swigpy_modules = {}
+
+
+def _register_module(env, modname, py_nodes, shlib_nodes):
+    _swigpy_modules[(env.Dir('.').get_abspath(), modname)] = (py_nodes, SCons.Util.flatten(shlib_nodes))
+
+
+def _SwigPyModuleImpl(env, builders, modname, pyconfs=None, **kw):
+    parts = modname.split('.')
+    (m2swigfile, m2cfile, m2shlibfile) = _module_files(env, kw)
     swig_file  = m2swigfile(parts)
     c_file     = m2cfile(parts)
     shlib_file = m2shlibfile(parts)
-    if '-c++' in kw.get('SWIGFLAGS', env.get('SWIGFLAGS',[])):
-        c_target = env.SwigPyCXXFile(c_file, swig_file, **kw)
+    split = kw.get('SWIGPY_SPLIT', env.get('SWIGPY_SPLIT'))
+    if split:
+        (c_target, c_nodes) = _SwigPySplitWrappers(env, builders, parts, split, m2swigfile,
+                                                   m2cfile, shlib_file, **kw)
     else:
-        c_target = env.SwigPyCFile(c_file, swig_file, **kw)
-    shlib_target = env.SwigPyShlib(shlib_file, c_target[0], **kw)
+        c_target = _SwigPyWrapper(env, builders, parts[-1], c_file, swig_file, **kw)
+        c_nodes = c_target[:1]
+    py_nodes = [n for n in c_target if n.name.endswith('.py')]
+    shlib_target = _SwigPyModuleShlibs(env, builders, c_nodes, shlib_file, pyconfs, py_nodes, **kw)
+    _register_module(env, modname, py_nodes, shlib_target)
     return SCons.Util.flatten(c_target + [shlib_target])
 
 
+def _SwigPyUnityImpl(env, builders, name, modules, pyconfs=None, **kw):
+    # Wrappers of all the modules are linked into a single container
+    # extension. For each module a python shim stands for its low-level
+    # module, the shim loads the container which registers the low-level
+    # modules bundled in it.
+    parts = name.split('.')
+    (m2swigfile, m2cfile, m2shlibfile) = _module_files(env, kw)
+    c_target = []
+    c_nodes = []
+    lowlevel = []
+    for modname in modules:
+        modparts = modname.split('.')
+        if modparts[:-1] != parts[:-1]:
+            raise SCons.Errors.UserError("SwigPyUnity: module %r is not in the package of %r"
+                                         % (modname, name))
+        if modparts[-1] == parts[-1]:
+            raise SCons.Errors.UserError("SwigPyUnity: module %r has the same name as the "
+                                         "unity extension" % modname)
+        wrapper = _SwigPyWrapper(env, builders, modparts[-1], m2cfile(modparts), m2swigfile(modparts),
+                                 **kw)
+        c_target += wrapper
+        c_nodes += wrapper[:1]
+        lowlevel.append('_' + modparts[-1])
+    shlib_file = m2shlibfile(parts)
+    container = builders.Override(kw).subst('$SWIGPY_SHLIBPREFIX') + os.path.basename(shlib_file)
+    init = builders.SwigPyInitFile(m2cfile(parts) + '_init', lowlevel, SWIGPY_INITMODULE=container)
+    shims = []
+    for low in lowlevel:
+        shims += builders.SwigPyShimFile(m2cfile(parts[:-1] + [low]), low,
+                                         SWIGPY_INITMODULE=container)
+    py_nodes = [n for n in c_target + shims if n.name.endswith('.py')]
+    shlib_target = _SwigPyModuleShlibs(env, builders, c_nodes + init, shlib_file, pyconfs,
+                                       py_nodes, **kw)
+    for modname in modules:
+        _register_module(env, modname, py_nodes, shlib_target)
+    return SCons.Util.flatten(c_target + init + shims + [shlib_target])
+
+
+def _limited_api_hex(version):
+    # '3.8' -> '0x03080000'
+    version = str(version)
+    if version.lower().startswith('0x'):
+        return version
+    try:
+        (major, minor) = [int(x) for x in version.split('.')[:2]]
+    except ValueError:
+        raise SCons.Errors.UserError("invalid SWIGPY_LIMITED_API version: %r" % version)
+    return '0x%02X%02X0000' % (major, minor)
+
+
+def _limited_api_defines(defines, version):
+    if SCons.Util.is_Dict(defines):
+        defines = list(defines.items())
+    elif not SCons.Util.is_List(defines):
+        defines = [defines]
+    return [d for d in defines if _define_name(d) != 'Py_LIMITED_API'] \
+        + [('Py_LIMITED_API', _limited_api_hex(version))]
+
+
+def _define_name(define):
+    # 'FOO', 'FOO=1' and ('FOO', 1) all define FOO
+    if SCons.Util.is_Sequence(define):
+        return define[0] if define else None
+    return str(define).split('=', 1)[0]
+
+
+def _limited_api_check(env):
+    # swig generates code which compiles with Py_LIMITED_API since 4.2
+    version = _version_tuple(env.subst('$SWIGVERSION'))
+    if version and version < (4, 2):
+        raise SCons.Errors.UserError("SWIGPY_LIMITED_API requires swig 4.2 or later, found %s"
+                                     % env.subst('$SWIGVERSION'))
+
+
+def _SwigPyLimitedApiSwigFlags(target, source, env, for_signature):
+    # $SWIGFLAGS of the call without -builtin, as builtin types can't be
+    # created with the limited API.
+    mode = SCons.Subst.SUBST_SIG if for_signature else SCons.Subst.SUBST_CMD
+    flags = env.subst_list('$_SWIGPY_USERSWIGFLAGS', mode, target, source)[0]
+    return [str(f).replace('$', '$$') for f in flags if str(f) != '-builtin']
+
+
+def _SwigPyLimitedApiOverrides(env, kw):
+    _limited_api_check(env)
+    kw = dict(kw)
+    kw.setdefault('SWIGPY_PYTHONLIB', '$SWIGPY_PYTHONABI3LIB')
+    kw.setdefault('SWIGPY_PYTHONLIBDIR', '$SWIGPY_PYTHONABI3LIBDIR')
+    kw.setdefault('SWIGPY_SHLIBSUFFIX', _limited_api_shlib_suffix())
+    return kw
+
+
+def _limited_api_shlib_suffix():
+    return '.pyd' if sys.platform == 'win32' else '.abi3.so'
+
+
+def _limited_api_py_config(pyconf):
+    return dict(pyconf, SWIGPY_PYTHONLIB='$SWIGPY_PYTHONABI3LIB',
+                        SWIGPY_PYTHONLIBDIR='$SWIGPY_PYTHONABI3LIBDIR')
+
+
+_optimize_profiles = {
+    'lto':   ['-flto'],
+    'speed': ['-O3', '-flto'],
+    'size':  ['-Os', '-flto'],
+}
+
+
+def _optimize_flags(env, profile):
+    # Flags of the SWIGPY_OPTIMIZE profile (GCC and Clang only). Wrappers are
+    # compiled with hidden visibility, swig marks the PyInit_* functions as
+    # visible, so they remain the only symbols exported.
+    flags = {'CCFLAGS': [], 'CXXFLAGS': [], 'LINKFLAGS': []}
+    if not profile:
+        return flags
+    try:
+        opt = _optimize_profiles[profile]
+    except (KeyError, TypeError):
+        raise SCons.Errors.UserError("invalid SWIGPY_OPTIMIZE profile: %r (expected one of %s)"
+                                     % (profile, ', '.join(sorted(_optimize_profiles))))
+    _gnu_cc_mode(env, 'SWIGPY_OPTIMIZE')
+    flags['CCFLAGS'] = opt + ['-fvisibility=hidden', '-fno-semantic-interposition',
+                              '-ffunction-sections', '-fdata-sections']
+    flags['CXXFLAGS'] = ['-fvisibility-inlines-hidden']
+    if env['PLATFORM'] == 'darwin':
+        flags['LINKFLAGS'] = opt + ['-Wl,-dead_strip']
+    else:
+        flags['LINKFLAGS'] = opt + ['-Wl,--gc-sections']
+    return flags
+
+
+# Flags of SWIGPY_SWIG_PERF presets with the range of swig versions which
+# support them: (flag, first version, first version without the flag).
+_swig_perf_presets = {
+    'fast':  [('-O', None, None),
+              ('-fastdispatch', None, None),
+              ('-fastproxy', None, None),
+              ('-fvirtual', None, None),
+              ('-fastunpack', '2.0', '4.0'),
+              ('-nosafecstrings', None, '4.0'),
+              ('-modernargs', None, '4.0')],
+    'small': [('-fvirtual', None, None),
+              ('-fastproxy', None, None),
+              ('-noproxydel', None, '4.0')],
+    'debug': [('-Wall', None, None),
+              ('-Wextra', None, None),
+              ('-nofastdispatch', None, None)],
+}
+
+
+def _version_tuple(version):
+    return tuple(int(x) for x in re.findall(r'\d+', str(version))[:3])
+
+
+def _swig_perf_flags(env, preset):
+    # Flags of the SWIGPY_SWIG_PERF preset supported by the swig in use. If
+    # swig version is unknown, the flags removed from swig are dropped.
+    if not preset:
+        return []
+    try:
+        flags = _swig_perf_presets[preset]
+    except (KeyError, TypeError):
+        raise SCons.Errors.UserError("invalid SWIGPY_SWIG_PERF preset: %r (expected one of %s)"
+                                     % (preset, ', '.join(sorted(_swig_perf_presets))))
+    version = _version_tuple(env.subst('$SWIGVERSION'))
+    if not version:
+        return [f for (f, since, until) in flags if until is None]
+    return [f for (f, since, until) in flags
+            if (since is None or version >= _version_tuple(since))
+            and (until is None or version < _version_tuple(until))]
+
+
+# Preset flags making swig generate code which uses CPython internals (-O
+# implies -fastproxy).
+_limited_api_unsafe_swigflags = ('-O', '-fastproxy')
+
+
+def _SwigPySwigPerfFlags(target, source, env, for_signature):
+    flags = _swig_perf_flags(env, env.get('SWIGPY_SWIG_PERF'))
+    if env.get('SWIGPY_LIMITED_API'):
+        flags = [f for f in flags if f not in _limited_api_unsafe_swigflags]
+    return flags
+
+
+def _SwigPyThreadsFlags(target, source, env, for_signature):
+    return ['-threads'] if env.get('SWIGPY_THREADS') else []
+
+
+def _nogil_flags(env, nogil):
+    if not nogil:
+        return []
+    version = _version_tuple(env.subst('$SWIGVERSION'))
+    if version and version < (4, 3):
+        raise SCons.Errors.UserError("SWIGPY_NOGIL requires swig 4.3 or later, found %s"
+                                     % env.subst('$SWIGVERSION'))
+    return ['-nogil']
+
+
+def _SwigPyNoGilFlags(target, source, env, for_signature):
+    return _nogil_flags(env, env.get('SWIGPY_NOGIL'))
+
+
+def _SwigPyFreeThreadingFlags(target, source, env, for_signature):
+    # Py_GIL_DISABLED comes from pyconfig.h, except on Windows, where it's
+    # up to the extension to define it. SWIGPY_NOGIL marks the SwigPyUnity()
+    # and SWIGPY_SPLIT init modules as not needing the GIL, as -nogil does for
+    # the swig modules.
+    defines = []
+    if env.get('SWIGPY_PYTHONGILDISABLED'):
+        defines.append('Py_GIL_DISABLED=1')
+    if env.get('SWIGPY_NOGIL'):
+        defines.append('SWIGPY_NOGIL')
+    return [env.subst('$CPPDEFPREFIX') + d + env.subst('$CPPDEFSUFFIX') for d in defines]
+
+
+def _free_threading_py_config(pyconf, kw):
+    # Extensions built for the free-threaded python can't be loaded by the
+    # GIL-enabled one, so they get the ABI-tagged suffix, e.g.
+    # '.cpython-313t-x86_64-linux-gnu.so'.
+    if pyconf.get('SWIGPY_PYTHONGILDISABLED'):
+        suffix = kw.get('SWIGPY_SHLIBSUFFIX', '$SWIGPY_PYTHONEXTSUFFIX')
+        return dict(pyconf, SWIGPY_SHLIBSUFFIX=suffix)
+    return pyconf
+
+
+def _free_threading_check(limited_api, pyconfs):
+    if limited_api and any(pyconf.get('SWIGPY_PYTHONGILDISABLED') for pyconf in pyconfs):
+        raise SCons.Errors.UserError("SWIGPY_LIMITED_API is not supported by free-threaded python")
+
+
+_linkers = ('bfd', 'gold', 'lld', 'mold')
+
+
+_detected_linkers = {}
+
+
+def _detect_linker(env):
+    # The fastest of the linkers the compiler driver can use, in order of
+    # preference, or None for its default one. Probed once per driver and
+    # PATH by making the driver run the linker with --version.
+    link = env.subst('$SHLINK').split()
+    environ = dict((k, str(v)) for k, v in env['ENV'].items())
+    key = (tuple(link), environ.get('PATH'))
+    try:
+        return _detected_linkers[key]
+    except KeyError:
+        pass
+    found = None
+    for linker in ('mold', 'lld', 'gold'):
+        try:
+            with open(os.devnull, 'w') as devnull:
+                status = subprocess.call(link + ['-fuse-ld=' + linker, '-Wl,--version'],
+                                         stdout=devnull, stderr=devnull, env=environ)
+        except OSError:
+            break
+        if status == 0:
+            found = linker
+            break
+    _detected_linkers[key] = found
+    return found
+
+
+def _linker_flags(env, linker):
+    if not linker:
+        return []
+    _gnu_cc_mode(env, 'SWIGPY_LINKER')
+    if linker == 'auto':
+        linker = _detect_linker(env)
+        if linker is None:
+            return []
+    if linker not in _linkers:
+        raise SCons.Errors.UserError("SWIGPY_LINKER must be 'auto' or one of %s, not %r"
+                                     % (', '.join(repr(l) for l in _linkers), linker))
+    return ['-fuse-ld=' + linker]
+
+
+def _compress_debug_flags(env, compress):
+    # -gz makes the compiler write compressed debug sections to the objects
+    # and the linker to the extension, True stands for the default format.
+    if not compress:
+        return []
+    _gnu_cc_mode(env, 'SWIGPY_COMPRESS_DEBUG')
+    if compress is True:
+        return ['-gz']
+    if compress not in ('zlib', 'zstd'):
+        raise SCons.Errors.UserError("SWIGPY_COMPRESS_DEBUG must be True, 'zlib' or 'zstd', not %r"
+                                     % (compress,))
+    return ['-gz=' + compress]
+
+
+def _SwigPyLinkerFlags(target, source, env, for_signature):
+    return _linker_flags(env, env.get('SWIGPY_LINKER'))
+
+
+def _SwigPyCompressDebugFlags(target, source, env, for_signature):
+    return _compress_debug_flags(env, env.get('SWIGPY_COMPRESS_DEBUG'))
+
+
+def _compiler_cache(env, cache):
+    # Path of the compiler cache program. True stands for ccache or sccache,
+    # whichever is found first (if any).
+    if not cache:
+        return None
+    if cache is True:
+        return env.WhereIs('ccache') or env.WhereIs('sccache')
+    path = env.WhereIs(cache)
+    if path is None:
+        raise SCons.Errors.UserError("SWIGPY_COMPILER_CACHE: %r not found" % (cache,))
+    return path
+
+
+def _compiler_cache_environ(env, environ):
+    # ccache rewrites absolute paths under CCACHE_BASEDIR to relative ones
+    # when hashing, so that checkouts in different directories share entries.
+    if 'CCACHE_BASEDIR' in environ:
+        return environ
+    return dict(environ, CCACHE_BASEDIR=env.Dir('#').get_abspath())
+
+
+def _SwigPyCompilerCache(target, source, env, for_signature):
+    cache = _compiler_cache(env, env.get('SWIGPY_COMPILER_CACHE'))
+    return [] if cache is None else [cache]
+
+
+def _SwigPyCompilerCacheFlags(target, source, env, for_signature):
+    # The debug info refers to the top directory as '.', so that objects
+    # built in different checkouts are the same. The flag is left out of
+    # signatures, as it changes with the location of the checkout.
+    if for_signature or not env.get('SWIGPY_COMPILER_CACHE') or _cc_name(env) in ('cl', 'icl'):
+        return []
+    return ['-fdebug-prefix-map=%s=.' % env.Dir('#').get_abspath()]
+
+
+class _SwigPyCompileAction(SCons.Action.CommandAction):
+    # Starts watching the statistics of the compiler cache when a wrapper is
+    # actually compiled (not with -n).
+    def execute(self, target, source, env, *args, **kw):
+        cache = _compiler_cache(env, env.get('SWIGPY_COMPILER_CACHE'))
+        if cache is not None:
+            watch_compiler_cache(cache, dict((k, str(v)) for k, v in env['ENV'].items()))
+        return SCons.Action.CommandAction.execute(self, target, source, env, *args, **kw)
+
+
+# The compiler cache is left out of signatures, so that enabling it doesn't
+# trigger recompilation.
+_SwigPyShCAction = _SwigPyCompileAction('$( $_SWIGPY_COMPILERCACHE $) $SHCCCOM', cmdstr='$SHCCCOMSTR')
+_SwigPyShCXXAction = _SwigPyCompileAction('$( $_SWIGPY_COMPILERCACHE $) $SHCXXCOM', cmdstr='$SHCXXCOMSTR')
+
+
+def _debuginfo_actions(env, mode):
+    # 'split' moves the debug info of the extension to a side file, which
+    # debuggers find through the .gnu_debuglink section, 'strip' drops it.
+    if mode in (None, False, 'keep'):
+        return []
+    if mode == 'strip':
+        return [_SwigPyStripAction]
+    if mode == 'split':
+        return [_SwigPyDebugKeepAction, _SwigPyStripAction, _SwigPyDebugLinkAction]
+    raise SCons.Errors.UserError("SWIGPY_DEBUGINFO must be 'split', 'strip' or 'keep', not %r"
+                                 % (mode,))
+
+
+def _SwigPyDebugInfoGenerator(target, source, env, for_signature):
+    return _debuginfo_actions(env, env.get('SWIGPY_DEBUGINFO'))
+
+
+def _SwigPyDebugInfoEmitter(target, source, env):
+    if env.get('SWIGPY_DEBUGINFO') == 'split':
+        shlib = target[0]
+        target = target + [shlib.dir.File(shlib.name + env.subst('$SWIGPY_DEBUGSUFFIX'))]
+    return (target, source)
+
+
+_SwigPyDebugKeepAction = SCons.Action.Action('$SWIGPY_DEBUGKEEPCOM', '$SWIGPY_DEBUGKEEPCOMSTR')
+_SwigPyStripAction = SCons.Action.Action('$SWIGPY_STRIPCOM', '$SWIGPY_STRIPCOMSTR')
+_SwigPyDebugLinkAction = SCons.Action.Action('$SWIGPY_DEBUGLINKCOM', '$SWIGPY_DEBUGLINKCOMSTR')
+
+
+def _SwigPyOptimizeFlags(var):
+    def flags(target, source, env, for_signature):
+        return _optimize_flags(env, env.get('SWIGPY_OPTIMIZE'))[var]
+    return flags
+
+
+def _SwigPyModuleOverrides(env, kw):
+    limited_api = kw.get('SWIGPY_LIMITED_API', env.get('SWIGPY_LIMITED_API'))
+    if kw.get('SWIGPY_LIMITED_API'):
+        kw = _SwigPyLimitedApiOverrides(env, kw)
+    if kw.get('SWIGPY_PYTHON') is not None:
+        pyconf = _py_config(env, kw['SWIGPY_PYTHON'])
+        _free_threading_check(limited_api, [pyconf])
+        if limited_api:
+            pyconf = _limited_api_py_config(pyconf)
+        kw = dict(_free_threading_py_config(pyconf, kw), **kw)
+    if kw.get('SWIGPY_OPTIMIZE'):
+        _optimize_flags(env, kw['SWIGPY_OPTIMIZE'])
+    if kw.get('SWIGPY_SWIG_PERF'):
+        _swig_perf_flags(env, kw['SWIGPY_SWIG_PERF'])
+    if kw.get('SWIGPY_NOGIL'):
+        _nogil_flags(env, kw['SWIGPY_NOGIL'])
+    if kw.get('SWIGPY_DEBUGINFO'):
+        _debuginfo_actions(env, kw['SWIGPY_DEBUGINFO'])
+    if kw.get('SWIGPY_LINKER'):
+        _linker_flags(env, kw['SWIGPY_LINKER'])
+    if kw.get('SWIGPY_COMPRESS_DEBUG'):
+        _compress_debug_flags(env, kw['SWIGPY_COMPRESS_DEBUG'])
+    if _compiler_cache(env, kw.get('SWIGPY_COMPILER_CACHE', env.get('SWIGPY_COMPILER_CACHE'))):
+        kw = dict(kw, ENV=_compiler_cache_environ(env, kw.get('ENV', env['ENV'])))
+    if kw.get('SWIGPY_NORMALIZE_SIG'):
+        kw.setdefault('SWIGPY_SWIGCOM', '$_SWIGPY_NORMALIZEDSWIGCOM')
+    pythons = kw.pop('SWIGPY_PYTHONS', env.get('SWIGPY_PYTHONS'))
+    if pythons:
+        pythons = SCons.Util.flatten(pythons)
+        pyconfs = [dict(_free_threading_py_config(pyconf, kw), SWIGPY_PYTHON=python)
+                   for python, pyconf in zip(pythons, _py_configs(env, pythons))]
+    else:
+        pyconfs = None
+    if pyconfs and limited_api:
+        _free_threading_check(limited_api, pyconfs)
+        # A single stable ABI extension serves all the interpreters, so build
+        # it once, against headers of the first one.
+        kw = dict(_limited_api_py_config(pyconfs[0]), **kw)
+        pyconfs = None
+    return (kw, pyconfs)
+
+
 def _SwigPyModule(env, modname, **kw):
     if (not SCons.Util.is_List(modname)):
         modname = [modname]
-    return SCons.Util.flatten([ _SwigPyModuleImpl(env, m, **kw) for m in modname ])
+    (kw, pyconfs) = _SwigPyModuleOverrides(env, kw)
+    builders = _SwigPyBuilders(env)
+    return SCons.Util.flatten([ _SwigPyModuleImpl(env, builders, m, pyconfs, **kw) for m in modname ])
+
+
+def _SwigPyUnity(env, name, modules, **kw):
+    modules = SCons.Util.flatten(modules)
+    if not modules:
+        return []
+    (kw, pyconfs) = _SwigPyModuleOverrides(env, kw)
+    builders = _SwigPyBuilders(env)
+    return _SwigPyUnityImpl(env, builders, name, modules, pyconfs, **kw)
 
 
 def createSwigPyCFileBuilders(env):
@@ -142,13 +1073,13 @@ def createSwigPyCFileBuilders(env):
     try:
         swigpy_c_file = env['BUILDERS']['SwigPyCFile']
     except KeyError:
-        swigpy_c_file = ReplacingBuilder(c_file, swigPyReplacements)
+        swigpy_c_file = SwigPyBuilder(c_file, swigPyReplacements)
         env['BUILDERS']['SwigPyCFile'] = swigpy_c_file
 
     try:
         swigpy_cxx_file = env['BUILDERS']['SwigPyCXXFile']
     except KeyError:
-        swigpy_cxx_file = ReplacingBuilder(cxx_file, swigPyReplacements)
+        swigpy_cxx_file = SwigPyBuilder(cxx_file, swigPyReplacements)
         env['BUILDERS']['SwigPyCXXFile'] = swigpy_cxx_file
 
     return (swigpy_c_file, swigpy_cxx_file)
@@ -179,7 +1110,7 @@ def createSwigPyObjBuilders(env):
                                              src_builder=['SwigPyCFile', 'SwigPyCXXFile'],
                                              source_scanner=SCons.Tool.SourceFileScanner,
                                              single_source=1)
-        swigpy_shobj = ReplacingBuilder(swigpy_shobj, swigPyReplacements)
+        swigpy_shobj = SwigPyBuilder(swigpy_shobj, swigPyReplacements)
         env['BUILDERS']['SwigPySharedObject'] = swigpy_shobj
 
     return (swigpy_obj, swigpy_shobj)
@@ -190,10 +1121,12 @@ def createSwigPyShlibBuilder(env):
         swigpy_shlib = env['BUILDERS']['SwigPyShlib']
     except KeyError:
         shlib = SCons.Tool.createSharedLibBuilder(env)
-        shlib = SCons.Builder.Builder(action=shlib.action,
-                                      emitter='$SHLIBEMITTER',
-                                      prefix='$SWIGPY_SHLIBPREFIX',
-                                      suffix='$SWIGPY_SHLIBSUFFIX',
+        debuginfo = SCons.Action.Action(_SwigPyDebugInfoGenerator, generator=1)
+        shlib = SCons.Builder.Builder(action=[shlib.action, debuginfo],
+                                      emitter=[SCons.Builder.EmitterProxy('SHLIBEMITTER'),
+                                               _SwigPyDebugInfoEmitter],
+                                      prefix='$SHLIBPREFIX',
+                                      suffix='$SHLIBSUFFIX',
                                       target_scanner=SCons.Tool.ProgramScanner,
                                       src_suffix="$SWIGPY_SHOBJSUFFIX",
                                       src_builder=['SwigPySharedObject'])
@@ -202,19 +1135,398 @@ def createSwigPyShlibBuilder(env):
     return swigpy_shlib
 
 
+def _package_module_name(path, m2swigfile):
+    # Inverse of m2swigfile: finds the module whose interface file is path
+    # (relative to the current SConscript directory).
+    path = os.path.normpath(path)
+    comps = os.path.splitext(path)[0].split(os.sep)
+    for i in range(len(comps)):
+        if os.path.normpath(m2swigfile(comps[i:])) == path:
+            return '.'.join(comps[i:])
+    raise SCons.Errors.UserError("can't determine module name for %r with SWIGPY_M2SWIGFILE" % path)
+
+
+def _SwigPyPackage(env, root, **kw):
+    (m2swigfile, m2cfile, _) = _module_files(env, kw)
+    index = kw.pop('SWIGPY_PACKAGE_INDEX', env.get('SWIGPY_PACKAGE_INDEX'))
+    if index:
+        index = env.File(env.subst(index)).get_abspath()
+    srcdir = env.Dir('.').srcnode()
+    rootdir = env.Dir(root).srcnode()
+    modnames = [_package_module_name(os.path.join(srcdir.rel_path(rootdir), path), m2swigfile)
+                for path in find_swig_modules(rootdir.get_abspath(), index)]
+    if not modnames:
+        return []
+    packages = set(tuple(m.split('.')[:i]) for m in modnames for i in range(1, m.count('.') + 1))
+    inits = []
+    for package in sorted(packages):
+        init = env.File(m2cfile(list(package) + ['__init__']) + '.py')
+        if not init.srcnode().exists() and not init.has_builder():
+            inits += env.SwigPyPackageInitFile(init, '.'.join(package))
+    return _SwigPyModule(env, modnames, **kw) + inits
+
+
+def _SwigPyInitFileAction(target, source, env):
+    container = env.subst('$SWIGPY_INITMODULE')
+    with open(str(target[0]), 'w') as f:
+        f.write(multi_init_c_source(container, [s.read() for s in source]))
+
+
+def _SwigPyFacadeFileAction(target, source, env):
+    container = env.subst('$SWIGPY_INITMODULE')
+    with open(str(target[0]), 'w') as f:
+        f.write(facade_py_source(container, [s.read() for s in source]))
+
+
+def _SwigPyShimFileAction(target, source, env):
+    container = env.subst('$SWIGPY_INITMODULE')
+    with open(str(target[0]), 'w') as f:
+        f.write(shim_py_source(container))
+
+
+def createSwigPyInitFileBuilders(env):
+    try:
+        swigpy_init_file = env['BUILDERS']['SwigPyInitFile']
+    except KeyError:
+        action = SCons.Action.Action(_SwigPyInitFileAction, '$SWIGPY_INITFILECOMSTR',
+                                     varlist=['SWIGPY_INITMODULE'])
+        swigpy_init_file = SCons.Builder.Builder(action=action,
+                                                 suffix='.c',
+                                                 source_factory=SCons.Node.Python.Value)
+        env['BUILDERS']['SwigPyInitFile'] = swigpy_init_file
+
+    try:
+        swigpy_facade_file = env['BUILDERS']['SwigPyFacadeFile']
+    except KeyError:
+        action = SCons.Action.Action(_SwigPyFacadeFileAction, '$SWIGPY_FACADEFILECOMSTR',
+                                     varlist=['SWIGPY_INITMODULE'])
+        swigpy_facade_file = SCons.Builder.Builder(action=action,
+                                                   suffix='.py',
+                                                   source_factory=SCons.Node.Python.Value)
+        env['BUILDERS']['SwigPyFacadeFile'] = swigpy_facade_file
+
+    try:
+        swigpy_shim_file = env['BUILDERS']['SwigPyShimFile']
+    except KeyError:
+        action = SCons.Action.Action(_SwigPyShimFileAction, '$SWIGPY_SHIMFILECOMSTR',
+                                     varlist=['SWIGPY_INITMODULE'])
+        swigpy_shim_file = SCons.Builder.Builder(action=action,
+                                                 suffix='.py',
+                                                 source_factory=SCons.Node.Python.Value)
+        env['BUILDERS']['SwigPyShimFile'] = swigpy_shim_file
+
+    return (swigpy_init_file, swigpy_facade_file, swigpy_shim_file)
+
+
+def _SwigPyNoThreadFileAction(target, source, env):
+    with open(str(target[0]), 'w') as f:
+        f.write('// Generated by swigpy, do not edit.\n')
+        for s in source:
+            f.write('%%nothread %s;\n' % s.read())
+        f.write('%%include "%s"\n' % env.subst('$SWIGPY_NOTHREADINCLUDE'))
+
+
+def createSwigPyNoThreadFileBuilder(env):
+    try:
+        swigpy_nothread_file = env['BUILDERS']['SwigPyNoThreadFile']
+    except KeyError:
+        action = SCons.Action.Action(_SwigPyNoThreadFileAction, '$SWIGPY_NOTHREADFILECOMSTR',
+                                     varlist=['SWIGPY_NOTHREADINCLUDE'])
+        swigpy_nothread_file = SCons.Builder.Builder(action=action,
+                                                     suffix='.i',
+                                                     source_factory=SCons.Node.Python.Value)
+        env['BUILDERS']['SwigPyNoThreadFile'] = swigpy_nothread_file
+    return swigpy_nothread_file
+
+
+def _SwigPyPackageInitFileAction(target, source, env):
+    with open(str(target[0]), 'w') as f:
+        f.write('# Generated by swigpy, do not edit.\n')
+
+
+def createSwigPyPackageInitFileBuilder(env):
+    try:
+        swigpy_package_init_file = env['BUILDERS']['SwigPyPackageInitFile']
+    except KeyError:
+        action = SCons.Action.Action(_SwigPyPackageInitFileAction,
+                                     '$SWIGPY_PACKAGEINITFILECOMSTR')
+        swigpy_package_init_file = SCons.Builder.Builder(action=action,
+                                                         suffix='.py',
+                                                         source_factory=SCons.Node.Python.Value)
+        env['BUILDERS']['SwigPyPackageInitFile'] = swigpy_package_init_file
+    return swigpy_package_init_file
+
+
+def _SwigPyPCHHeaderAction(target, source, env):
+    with open(str(target[0]), 'w') as f:
+        f.write(_pch_header_source([s.read() for s in source]))
+
+
+def createSwigPyPCHBuilders(env):
+    try:
+        swigpy_pch_header = env['BUILDERS']['SwigPyPCHHeader']
+    except KeyError:
+        action = SCons.Action.Action(_SwigPyPCHHeaderAction, '$SWIGPY_PCHHEADERCOMSTR')
+        swigpy_pch_header = SCons.Builder.Builder(action=action,
+                                                  source_factory=SCons.Node.Python.Value)
+        env['BUILDERS']['SwigPyPCHHeader'] = swigpy_pch_header
+
+    try:
+        swigpy_pch = env['BUILDERS']['SwigPyPCH']
+    except KeyError:
+        action = {'.h': SCons.Action.Action('$SWIGPY_PCHCCCOM', '$SWIGPY_PCHCCCOMSTR'),
+                  '.hpp': SCons.Action.Action('$SWIGPY_PCHCXXCOM', '$SWIGPY_PCHCXXCOMSTR')}
+        swigpy_pch = SCons.Builder.Builder(action=action,
+                                           suffix='$SWIGPY_PCHSUFFIX',
+                                           source_scanner=SCons.Tool.SourceFileScanner,
+                                           single_source=1)
+        swigpy_pch = SwigPyBuilder(swigpy_pch, swigPyReplacements)
+        env['BUILDERS']['SwigPyPCH'] = swigpy_pch
+
+    return (swigpy_pch_header, swigpy_pch)
+
+
+def _SwigPyRuntime(env, target=None, **kw):
+    # Generates the swig runtime header for hand-written code interoperating
+    # with the swig modules. The header is generated once per target file, no
+    # matter how many times this is called.
+    if target is None:
+        target = env.Override(kw).subst('$SWIGPY_RUNTIMEFILE')
+    target = env.File(target)
+    if target.has_builder():
+        return [target]
+    return env.SwigPyRuntimeHeader(target, [], **kw)
+
+
+def _module_root(node, modname):
+    # Directory to be put on PYTHONPATH to import modname from node.
+    root = node.dir
+    for i in range(modname.count('.')):
+        root = root.up()
+    return root
+
+
+def _SwigPyBench(env, modname, target=None, **kw):
+    # Benchmarks modules built by SwigPyModule() (or SwigPyUnity()) in this
+    # directory with the interpreter they were built for.
+    if not SCons.Util.is_List(modname):
+        modname = [modname]
+    if target is None:
+        target = env.Override(kw).subst('$SWIGPY_BENCHFILE')
+    python = kw.get('SWIGPY_PYTHON', env.get('SWIGPY_PYTHON'))
+    tag = _py_config(env, python)['SWIGPY_PYTHONTAG']
+    here = env.Dir('.').get_abspath()
+    sources = []
+    path = []
+    for m in modname:
+        try:
+            (py_nodes, shlib_nodes) = _swigpy_modules[(here, m)]
+        except KeyError:
+            raise SCons.Errors.UserError("SwigPyBench: module %r is not built in %s" % (m, here))
+        # With SWIGPY_PYTHONS, only the extension built for python is used.
+        shlib_nodes = [n for n in shlib_nodes
+                       if n.get_env().get('SWIGPY_PYTHONTAG') == tag] or shlib_nodes
+        for node in shlib_nodes + py_nodes:
+            root = _module_root(node, m).get_abspath()
+            if root not in path:
+                path.append(root)
+        sources += shlib_nodes + py_nodes
+    baseline = kw.get('SWIGPY_BENCH_BASELINE', env.get('SWIGPY_BENCH_BASELINE'))
+    if baseline:
+        sources.append(env.File(env.subst(baseline)))
+    result = env.SwigPyBenchResults(target, sources,
+                                    _SWIGPY_BENCHPYTHON=_which_python(env, python) or sys.executable,
+                                    _SWIGPY_BENCHMODULES=modname,
+                                    _SWIGPY_BENCHPATH=path, **kw)
+    threshold = kw.get('SWIGPY_BENCH_THRESHOLD', env.get('SWIGPY_BENCH_THRESHOLD'))
+    if threshold is not None and not baseline:
+        # Compared with the previous results, which must survive the rebuild.
+        env.Precious(result)
+    # Built only on request (by the alias or the file), not by default.
+    for node in result:
+        env.Ignore(node.dir, node)
+    env.Alias(env.Override(kw).subst('$SWIGPY_BENCHALIAS'), result)
+    return result
+
+
+def _SwigPyBenchAction(target, source, env):
+    calls = env.get('SWIGPY_BENCH_CALL') or {}
+    results = {'python': env['_SWIGPY_BENCHPYTHON'], 'modules': {}}
+    environ = dict((k, str(v)) for k, v in env['ENV'].items())
+    for m in env['_SWIGPY_BENCHMODULES']:
+        stmt = calls if SCons.Util.is_String(calls) else calls.get(m)
+        results['modules'][m] = bench_module(env['_SWIGPY_BENCHPYTHON'], m,
+                                             env['_SWIGPY_BENCHPATH'], environ,
+                                             calls=int(env.get('SWIGPY_BENCH_CALLS', 100000)),
+                                             repeat=int(env.get('SWIGPY_BENCH_REPEAT', 5)),
+                                             stmt=stmt)
+    threshold = env.get('SWIGPY_BENCH_THRESHOLD')
+    if threshold is not None:
+        baseline = env.get('SWIGPY_BENCH_BASELINE')
+        old = load_results(env.subst(baseline) if baseline else str(target[0]))
+        found = regressions(old, results, float(threshold)) if old else []
+        if found:
+            for (m, metric, a, b) in found:
+                sys.stderr.write("swigpy: %s: %s regressed from %.6g to %.6g (threshold %g%%)\n"
+                                 % (m, metric, a, b, float(threshold) * 100))
+            # The previous results are kept as the baseline.
+            return 1
+    save_results(str(target[0]), results)
+    return 0
+
+
+def createSwigPyBenchBuilder(env):
+    try:
+        swigpy_bench = env['BUILDERS']['SwigPyBenchResults']
+    except KeyError:
+        action = SCons.Action.Action(_SwigPyBenchAction, '$SWIGPY_BENCHCOMSTR',
+                                     varlist=['_SWIGPY_BENCHPYTHON', '_SWIGPY_BENCHMODULES',
+                                              'SWIGPY_BENCH_CALL', 'SWIGPY_BENCH_CALLS',
+                                              'SWIGPY_BENCH_REPEAT', 'SWIGPY_BENCH_THRESHOLD'])
+        swigpy_bench = SCons.Builder.Builder(action=action, suffix='.json')
+        env['BUILDERS']['SwigPyBenchResults'] = swigpy_bench
+    return swigpy_bench
+
+
+def createSwigPyPGOTrainBuilder(env):
+    try:
+        swigpy_pgo_train = env['BUILDERS']['SwigPyPGOTrain']
+    except KeyError:
+        action = SCons.Action.Action(_SwigPyPGOTrainAction, '$SWIGPY_PGOTRAINCOMSTR',
+                                     varlist=['_SWIGPY_PGOMODE', '_SWIGPY_PGOPYTHON'])
+        swigpy_pgo_train = SCons.Builder.Builder(action=action)
+        env['BUILDERS']['SwigPyPGOTrain'] = swigpy_pgo_train
+    return swigpy_pgo_train
+
+
+def createSwigPyRuntimeBuilder(env):
+    try:
+        swigpy_runtime = env['BUILDERS']['SwigPyRuntimeHeader']
+    except KeyError:
+        action = SCons.Action.Action('$SWIGPY_RUNTIMECOM', '$SWIGPY_RUNTIMECOMSTR',
+                                     varlist=['SWIGVERSION'])
+        swigpy_runtime = SCons.Builder.Builder(action=action, suffix='.h')
+        swigpy_runtime = ReplacingBuilder(swigpy_runtime, swigPyReplacements)
+        env['BUILDERS']['SwigPyRuntimeHeader'] = swigpy_runtime
+    return swigpy_runtime
+
+
+def _py_config_cache_file(env):
+    cache = env.get('SWIGPY_PYCONF_CACHE')
+    if not cache:
+        return None
+    return env.File(env.subst(cache)).get_abspath()
+
+
+def _which_python(env, python):
+    if python is None:
+        return None
+    python = env.subst(python)
+    return env.WhereIs(python) or python
+
+
+def _py_configs(env, pythons):
+    pythons = [_which_python(env, python) for python in pythons]
+    try:
+        return get_py_configs(pythons, _py_config_cache_file(env))
+    except (OSError, RuntimeError, ValueError) as e:
+        raise SCons.Errors.UserError("failed to probe python interpreters %r: %s" % (pythons, e))
+
+
+def _py_config(env, python=None):
+    return _py_configs(env, [python])[0]
+
+
 def swigPySetDefaults(env):
+    limited_api = env.get('SWIGPY_LIMITED_API')
+    if limited_api:
+        env.SetDefault(SWIGPY_PYTHONLIB='$SWIGPY_PYTHONABI3LIB')
+        env.SetDefault(SWIGPY_PYTHONLIBDIR='$SWIGPY_PYTHONABI3LIBDIR')
+        env.SetDefault(SWIGPY_SHLIBSUFFIX=_limited_api_shlib_suffix())
     # SetDefault(SWIGPY_PYTHONINCDIR=..., SWIGPY_PYTHONLIB=..., SWIGPY_PYTHONLIBDIR=...)
-    env.SetDefault(**get_py_config())
+    env.SetDefault(**_py_config(env, env.get('SWIGPY_PYTHON')))
+    _free_threading_check(limited_api, [env])
     env.SetDefault(SWIGPY_SHLIBPREFIX='_')
     env.SetDefault(SWIGPY_LIBPREFIX='_')
     env.SetDefault(SWIGPY_IMPLIBPREFIX='_')
     env.SetDefault(SWIGPY_WINDOWSEXPPREFIX='_')
+    env.SetDefault(SWIGPY_PYTHONVARIANTDIR='$SWIGPY_PYTHONTAG')
+    env.SetDefault(SWIGPY_PCHDIR='.')
+    env.SetDefault(SWIGPY_PCHSUFFIX='.gch')
+    env.SetDefault(SWIGPY_PCHCCCOM='$SHCC -o $TARGET -x c-header -c $SHCFLAGS $SHCCFLAGS $_CCCOMCOM $SOURCES')
+    env.SetDefault(SWIGPY_PCHCXXCOM='$SHCXX -o $TARGET -x c++-header -c $SHCXXFLAGS $SHCCFLAGS $_CCCOMCOM $SOURCES')
+    env.SetDefault(SWIGPY_RUNTIMEFILE='swigpyrun.h')
+    env.SetDefault(SWIGPY_BENCHFILE='swigpy_bench.json')
+    env.SetDefault(SWIGPY_BENCHALIAS='swigpy-bench')
+    env.SetDefault(SWIGPY_RUNTIMECOM='$SWIG -python -external-runtime $TARGET')
+    env.SetDefault(_SWIGPY_NORMALIZEDSWIGFLAGS=_SwigPyNormalizedSwigFlags)
+    env.SetDefault(SWIGPY_PGODIR='pgo')
+    env.SetDefault(SWIGPY_LLVMPROFDATA='llvm-profdata')
+    # By default GCC identifies static functions in profiles by the path of
+    # the object file, which differs between the instrumented and final builds.
+    env.SetDefault(_SWIGPY_PGOGCCFLAGS=['--param', 'profile-func-internal-id=1'])
+    env.SetDefault(SWIGPY_PGOGENFLAGS_GCC=['-fprofile-generate', '$_SWIGPY_PGOGCCFLAGS'])
+    env.SetDefault(SWIGPY_PGOUSEFLAGS_GCC=['-fprofile-use', '-fprofile-correction',
+                                           '-Wno-missing-profile', '$_SWIGPY_PGOGCCFLAGS'])
+    env.SetDefault(SWIGPY_PGOGENFLAGS_CLANG=['-fprofile-instr-generate'])
+    env.SetDefault(SWIGPY_PGOUSEFLAGS_CLANG=['-fprofile-instr-use=$_SWIGPY_PGOPROFILE'])
+    env.SetDefault(_SWIGPY_PGOFLAGS=[])
+    env.SetDefault(_SWIGPY_SWIGPERFFLAGS=_SwigPySwigPerfFlags)
+    env.SetDefault(_SWIGPY_THREADSFLAGS=_SwigPyThreadsFlags)
+    env.SetDefault(SWIGPY_NOTHREADDIR='swigpy_nothread')
+    env.SetDefault(_SWIGPY_OPTIMIZECCFLAGS=_SwigPyOptimizeFlags('CCFLAGS'))
+    env.SetDefault(_SWIGPY_OPTIMIZECXXFLAGS=_SwigPyOptimizeFlags('CXXFLAGS'))
+    env.SetDefault(_SWIGPY_OPTIMIZELINKFLAGS=_SwigPyOptimizeFlags('LINKFLAGS'))
+    env.SetDefault(_SWIGPY_NORMALIZEDSWIGCOM='$SWIG -o $TARGET ${_SWIGOUTDIR} ${_SWIGINCFLAGS} '
+                                            '$( $SWIGFLAGS $) $_SWIGPY_NORMALIZEDSWIGFLAGS $SOURCES')
+    if env.get('SWIGPY_NORMALIZE_SIG'):
+        env.SetDefault(SWIGPY_SWIGCOM='$_SWIGPY_NORMALIZEDSWIGCOM')
+    env.SetDefault(SWIGPY_OBJCOPY='objcopy')
+    env.SetDefault(SWIGPY_STRIP='strip')
+    env.SetDefault(SWIGPY_DEBUGSUFFIX='.debug')
+    env.SetDefault(SWIGPY_DEBUGKEEPCOM='$SWIGPY_OBJCOPY --only-keep-debug $TARGET ${TARGET}$SWIGPY_DEBUGSUFFIX')
+    env.SetDefault(SWIGPY_STRIPCOM='$SWIGPY_STRIP --strip-debug $TARGET')
+    env.SetDefault(SWIGPY_DEBUGLINKCOM='$SWIGPY_OBJCOPY --add-gnu-debuglink=${TARGET}$SWIGPY_DEBUGSUFFIX $TARGET')
+    env.SetDefault(_SWIGPY_LINKERFLAGS=_SwigPyLinkerFlags)
+    env.SetDefault(_SWIGPY_COMPRESSDEBUGFLAGS=_SwigPyCompressDebugFlags)
+    env.SetDefault(_SWIGPY_COMPILERCACHE=_SwigPyCompilerCache)
+    env.SetDefault(_SWIGPY_COMPILERCACHEFLAGS=_SwigPyCompilerCacheFlags)
+    env.SetDefault(_SWIGPY_NOGILFLAGS=_SwigPyNoGilFlags)
+    env.SetDefault(_SWIGPY_FREETHREADINGFLAGS=_SwigPyFreeThreadingFlags)
+    # _foo.cpython-312-x86_64-linux-gnu.so is the first name tried by the
+    # importer, and the ones built for different interpreters don't collide.
+    if env.get('SWIGPY_PYTHONGILDISABLED') or not env.get('SWIGPY_LEGACY_SHLIBSUFFIX'):
+        env.SetDefault(SWIGPY_SHLIBSUFFIX='$SWIGPY_PYTHONEXTSUFFIX')
     if sys.platform == 'win32':
         env.SetDefault(SWIGPY_SHLIBSUFFIX='.pyd')
     #
     swigPyReplacements.inject(env, 'SetDefault')
     #
-    env.AppendUnique(SWIGPY_SWIGFLAGS=[ '-python', '-builtin' ])
+    if limited_api:
+        _limited_api_check(env)
+        env.AppendUnique(SWIGPY_SWIGFLAGS=[ '-python' ])
+    else:
+        env.AppendUnique(SWIGPY_SWIGFLAGS=[ '-python', '-builtin' ])
+    _optimize_flags(env, env.get('SWIGPY_OPTIMIZE'))
+    _swig_perf_flags(env, env.get('SWIGPY_SWIG_PERF'))
+    _nogil_flags(env, env.get('SWIGPY_NOGIL'))
+    _debuginfo_actions(env, env.get('SWIGPY_DEBUGINFO'))
+    _linker_flags(env, env.get('SWIGPY_LINKER'))
+    _compress_debug_flags(env, env.get('SWIGPY_COMPRESS_DEBUG'))
+    _compiler_cache(env, env.get('SWIGPY_COMPILER_CACHE'))
+    # Flags of the features, see _SwigPyFeatureOverride()
+    env.SetDefault(_SWIGPY_DEPDBFLAGS=[])
+    env.SetDefault(_SWIGPY_LIMITEDAPISWIGFLAGS=_SwigPyLimitedApiSwigFlags)
+    env.SetDefault(_SWIGPY_PCHFLAGS=[])
+    env.SetDefault(_SWIGPY_SWIGFLAGS=['$_SWIGPY_SWIGPERFFLAGS', '$_SWIGPY_THREADSFLAGS',
+                                      '$_SWIGPY_NOGILFLAGS', '$_SWIGPY_DEPDBFLAGS'])
+    env.SetDefault(_SWIGPY_CCFLAGS=['$_SWIGPY_FREETHREADINGFLAGS', '$_SWIGPY_OPTIMIZECCFLAGS',
+                                    '$_SWIGPY_PGOFLAGS', '$_SWIGPY_COMPRESSDEBUGFLAGS',
+                                    '$_SWIGPY_COMPILERCACHEFLAGS', '$_SWIGPY_PCHFLAGS'])
+    env.SetDefault(_SWIGPY_CXXFLAGS=['$_SWIGPY_OPTIMIZECXXFLAGS'])
+    env.SetDefault(_SWIGPY_LINKFLAGS=['$_SWIGPY_OPTIMIZELINKFLAGS', '$_SWIGPY_PGOFLAGS',
+                                      '$_SWIGPY_LINKERFLAGS', '$_SWIGPY_COMPRESSDEBUGFLAGS'])
+    env.PrependUnique(SCANNERS=[SwigPyDepScanner])
     env.AppendUnique(SWIGPY_CPPPATH=["$SWIGPY_PYTHONINCDIR"])
     env.AppendUnique(SWIGPY_LIBS=["$SWIGPY_PYTHONLIB"])
     env.AppendUnique(SWIGPY_LIBPATH=["$SWIGPY_PYTHONLIBDIR"])
@@ -234,9 +1546,20 @@ def generate(env):
     (c_file, cxx_file) = createSwigPyCFileBuilders(env)
     (static_obj, shared_obj) = createSwigPyObjBuilders(env)
     _setup_obj_builder(static_obj, CAction, CXXAction, StaticObjectEmitter)
-    _setup_obj_builder(shared_obj, ShCAction, ShCXXAction, SharedObjectEmitter)
+    _setup_obj_builder(shared_obj, _SwigPyShCAction, _SwigPyShCXXAction, SharedObjectEmitter)
     createSwigPyShlibBuilder(env)
+    createSwigPyInitFileBuilders(env)
+    createSwigPyPackageInitFileBuilder(env)
+    createSwigPyNoThreadFileBuilder(env)
+    createSwigPyPCHBuilders(env)
+    createSwigPyRuntimeBuilder(env)
+    createSwigPyPGOTrainBuilder(env)
+    createSwigPyBenchBuilder(env)
     env.AddMethod(_SwigPyModule, 'SwigPyModule')
+    env.AddMethod(_SwigPyPackage, 'SwigPyPackage')
+    env.AddMethod(_SwigPyUnity, 'SwigPyUnity')
+    env.AddMethod(_SwigPyRuntime, 'SwigPyRuntime')
+    env.AddMethod(_SwigPyBench, 'SwigPyBench')
     swigPySetDefaults(env)
 
 def exists(env):
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (c) 2014-2020 by Paweł Tomulik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+# Benchmark SwigPyModule() on synthetic projects with many modules
+
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    from shutil import which
+except ImportError:
+    from distutils.spawn import find_executable as which
+
+def info(msg, **kw):
+    try: quiet = kw['quiet']
+    except KeyError: quiet = False
+    if not quiet:
+        sys.stdout.write("%s: info: %s\n" % (_script, msg))
+
+def write_file(path, content):
+    dirname = os.path.dirname(path)
+    if dirname and not os.path.isdir(dirname):
+        os.makedirs(dirname)
+    with open(path, 'w') as f:
+        f.write(content)
+
+def module_names(count):
+    # Dotted names, ten modules per package: pkg0.sub.mod0, pkg0.sub.mod1, ...
+    return ['pkg%d.sub.mod%d' % (i // 10, i) for i in range(count)]
+
+_sconstruct = """\
+# SConstruct
+import json
+import os
+import time
+kw = dict((k, eval(v)) for k, v in ARGUMENTS.items())
+env = Environment(tools=['default'], ENV={'PATH': os.environ['PATH']}, **kw)
+t0 = time.time()
+env.Tool('swigpy')
+t1 = time.time()
+SConscript('src/SConscript', exports=['env'], variant_dir='build', duplicate=0)
+t2 = time.time()
+with open('phases.json', 'w') as f:
+    json.dump({'tool_load': t1 - t0, 'sconscript_read': t2 - t1}, f)
+"""
+
+_sconscript = """\
+# src/SConscript
+import os
+Import(['env'])
+env.SwigPyModule(%(names)r,
+                 SWIGPY_M2SWIGFILE=lambda parts: os.path.join('swig', *parts) + '.i',
+                 SWIGPY_SWIGPATH=['swig/include'],
+                 SWIGPY_SWIGFLAGS=%(swigflags)r)
+"""
+
+_include = """\
+// src/swig/include/inc%(level)d.i
+%(next)s
+%%constant int INC%(level)d = %(level)d;
+"""
+
+_c_module = """\
+// src/swig/%(path)s.i
+%%module %(name)s
+%%include "inc0.i"
+%%inline %%{
+int %(name)s_add(int a, int b) { return a + b + %(index)d; }
+%%}
+"""
+
+_cxx_module = """\
+// src/swig/%(path)s.i
+%%module %(name)s
+%%include "inc0.i"
+%%inline %%{
+struct %(name)s_adder {
+  int add(int a, int b) const { return a + b + %(index)d; }
+};
+%%}
+"""
+
+def tool_files():
+    # the tool consists of all the python modules found in the top source directory
+    return [name for name in sorted(os.listdir(_topsrcdir))
+            if name.endswith('.py') and name != 'setup.py']
+
+def generate_project(workdir, count, lang, depth):
+    if os.path.exists(workdir):
+        shutil.rmtree(workdir)
+    tooldir = os.path.join(workdir, 'site_scons', 'site_tools', 'swigpy')
+    os.makedirs(tooldir)
+    for name in tool_files():
+        shutil.copy(os.path.join(_topsrcdir, name), tooldir)
+    names = module_names(count)
+    swigflags = ['-python', '-builtin'] + (['-c++'] if lang == 'cxx' else [])
+    write_file(os.path.join(workdir, 'SConstruct'), _sconstruct)
+    write_file(os.path.join(workdir, 'src', 'SConscript'), _sconscript % locals())
+    for level in range(depth):
+        inc = '%%include "inc%d.i"' % (level + 1) if level + 1 < depth else ''
+        write_file(os.path.join(workdir, 'src', 'swig', 'include', 'inc%d.i' % level),
+                   _include % {'level': level, 'next': inc})
+    template = _cxx_module if lang == 'cxx' else _c_module
+    for index, modname in enumerate(names):
+        parts = modname.split('.')
+        path = '/'.join(parts)
+        write_file(os.path.join(workdir, 'src', 'swig', *parts) + '.i',
+                   template % {'path': path, 'name': parts[-1], 'index': index})
+
+def run_scons(scons, workdir, jobs):
+    t0 = time.time()
+    subprocess.check_call(scons + ['-Q', '-j%d' % jobs] + _args.set, cwd=workdir,
+                          stdout=open(os.devnull, 'w'))
+    elapsed = time.time() - t0
+    with open(os.path.join(workdir, 'phases.json')) as f:
+        phases = json.load(f)
+    return (elapsed, phases)
+
+def benchmark(scons, workdir, count, lang, depth, jobs, **kw):
+    info("%s, %d modules: generating project in '%s'" % (lang, count, workdir), **kw)
+    generate_project(workdir, count, lang, depth)
+    info("%s, %d modules: full build (-j%d)" % (lang, count, jobs), **kw)
+    (full_build, _) = run_scons(scons, workdir, jobs)
+    info("%s, %d modules: null build" % (lang, count), **kw)
+    (null_build, phases) = run_scons(scons, workdir, jobs)
+    return {'lang': lang,
+            'modules': count,
+            'tool_load': phases['tool_load'],
+            'sconscript_read': phases['sconscript_read'],
+            'null_build': null_build,
+            'full_build': full_build}
+
+def report(results):
+    columns = ['lang', 'modules', 'tool_load', 'sconscript_read', 'null_build', 'full_build']
+    lines = ['%-5s %8s %10s %16s %11s %11s' % tuple(columns)]
+    for r in results:
+        lines.append('%-5s %8d %10.3f %16.3f %11.3f %11.3f' % tuple(r[c] for c in columns))
+    return '\n'.join(lines) + '\n'
+
+# The script...
+_script = os.path.basename(sys.argv[0])
+_scriptabs = os.path.realpath(sys.argv[0])
+_scriptdir = os.path.dirname(_scriptabs)
+_topsrcdir = os.path.realpath(os.path.join(_scriptdir, '..'))
+
+_parser = argparse.ArgumentParser(
+        prog=_script,
+        description="""\
+        This tool generates synthetic projects with many swig modules and
+        measures the time of loading swigpy tool, reading SConscripts, null
+        build and full build with SCons. Times are given in seconds.
+        """)
+
+_parser.add_argument('--quiet',
+                      action='store_true',
+                      help='do not print messages')
+_parser.add_argument('--modules',
+                      type=int,
+                      nargs='+',
+                      default=[10, 100, 1000],
+                      metavar='N',
+                      help='numbers of modules to benchmark (default: 10 100 1000)')
+_parser.add_argument('--lang',
+                      choices=['c', 'cxx'],
+                      nargs='+',
+                      default=['c', 'cxx'],
+                      help='wrapper languages to benchmark (default: c cxx)')
+_parser.add_argument('--depth',
+                      type=int,
+                      default=10,
+                      metavar='N',
+                      help='depth of %%include chain of each module (default: 10)')
+_parser.add_argument('-j', '--jobs',
+                      type=int,
+                      default=multiprocessing.cpu_count(),
+                      metavar='N',
+                      help='number of parallel jobs for full build (default: number of CPUs)')
+_parser.add_argument('--scons',
+                      default=which('scons'),
+                      metavar='PATH',
+                      help='scons script to be used (default: scons found in PATH)')
+_parser.add_argument('--set',
+                      action='append',
+                      default=[],
+                      metavar='VAR=EXPR',
+                      help='construction variable for the benchmarked Environment, '
+                           'EXPR is a python expression, e.g. --set "SWIGPY_PCH=True"')
+_parser.add_argument('--workdir',
+                      metavar='DIR',
+                      help='directory for generated projects (default: temporary directory)')
+_parser.add_argument('--json',
+                      metavar='FILE',
+                      help='write results to FILE as JSON')
+
+_args = _parser.parse_args()
+
+def main():
+    if not _args.scons:
+        sys.stderr.write("%s: error: scons not found, use --scons\n" % _script)
+        return 2
+    scons = [sys.executable, _args.scons]
+    workdir = _args.workdir or tempfile.mkdtemp(prefix='swigpy-bench-')
+    results = []
+    try:
+        for lang in _args.lang:
+            for count in _args.modules:
+                projdir = os.path.join(workdir, '%s-%d' % (lang, count))
+                results.append(benchmark(scons, projdir, count, lang, _args.depth,
+                                         _args.jobs, quiet=_args.quiet))
+    finally:
+        if not _args.workdir:
+            shutil.rmtree(workdir)
+    sys.stdout.write(report(results))
+    if _args.json:
+        with open(_args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
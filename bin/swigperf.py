@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (c) 2014-2020 by Paweł Tomulik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+# Measure call overhead of swig wrappers built with SWIGPY_SWIG_PERF presets
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+try:
+    from shutil import which
+except ImportError:
+    from distutils.spawn import find_executable as which
+
+def info(msg, **kw):
+    try: quiet = kw['quiet']
+    except KeyError: quiet = False
+    if not quiet:
+        sys.stdout.write("%s: info: %s\n" % (_script, msg))
+
+def write_file(path, content):
+    dirname = os.path.dirname(path)
+    if dirname and not os.path.isdir(dirname):
+        os.makedirs(dirname)
+    with open(path, 'w') as f:
+        f.write(content)
+
+_sconstruct = """\
+# SConstruct
+import os
+env = Environment(tools=['default', 'swigpy'], ENV={'PATH': os.environ['PATH']})
+env.Append(SWIGPY_SWIGFLAGS=['-c++'])
+if not %(builtin)r:
+    env['SWIGPY_SWIGFLAGS'] = [f for f in env['SWIGPY_SWIGFLAGS'] if f != '-builtin']
+for preset in ARGUMENTS['presets'].split(','):
+    SConscript('src/SConscript', exports=['env', 'preset'],
+               variant_dir=os.path.join('build', preset), duplicate=0)
+"""
+
+_sconscript = """\
+# src/SConscript
+Import(['env', 'preset'])
+env.SwigPyModule('bench', SWIGPY_SWIG_PERF=(None if preset == 'none' else preset))
+"""
+
+_interface = """\
+// src/bench.i
+%module bench
+%inline %{
+int add(int a, int b) { return a + b; }
+int scale(int x) { return 2 * x; }
+double scale(double x) { return 2.0 * x; }
+const char *echo(const char *s) { return s; }
+class Counter {
+public:
+  Counter() : n(0) {}
+  void inc() { ++n; }
+  int get() const { return n; }
+private:
+  int n;
+};
+%}
+"""
+
+# Run by the interpreter the modules were built for, prints timings as JSON.
+_timer = """\
+import json, sys, timeit
+import bench
+c = bench.Counter()
+cases = [('function', lambda: bench.add(1, 2)),
+         ('overload', lambda: bench.scale(2.0)),
+         ('string', lambda: bench.echo('abc')),
+         ('method', c.inc)]
+calls = int(sys.argv[1])
+result = {}
+for name, func in cases:
+    result[name] = timeit.timeit(func, number=calls) / calls * 1e9
+print(json.dumps(result))
+"""
+
+_cases = ['function', 'overload', 'string', 'method']
+
+def tool_files():
+    # the tool consists of all the python modules found in the top source directory
+    return [name for name in sorted(os.listdir(_topsrcdir))
+            if name.endswith('.py') and name != 'setup.py']
+
+def generate_project(workdir, builtin):
+    if os.path.exists(workdir):
+        shutil.rmtree(workdir)
+    tooldir = os.path.join(workdir, 'site_scons', 'site_tools', 'swigpy')
+    os.makedirs(tooldir)
+    for name in tool_files():
+        shutil.copy(os.path.join(_topsrcdir, name), tooldir)
+    write_file(os.path.join(workdir, 'SConstruct'), _sconstruct % locals())
+    write_file(os.path.join(workdir, 'src', 'SConscript'), _sconscript)
+    write_file(os.path.join(workdir, 'src', 'bench.i'), _interface)
+
+def build(scons, workdir, presets):
+    subprocess.check_call(scons + ['-Q', 'presets=%s' % ','.join(presets)], cwd=workdir,
+                          stdout=open(os.devnull, 'w'))
+
+def measure(workdir, preset, calls):
+    env = dict(os.environ, PYTHONPATH=os.path.join(workdir, 'build', preset))
+    out = subprocess.check_output([sys.executable, '-c', _timer, str(calls)],
+                                  env=env, universal_newlines=True)
+    return json.loads(out)
+
+def benchmark(workdir, presets, calls, repeat, **kw):
+    # Presets are measured in turns, so that they're equally affected by
+    # changing load of the machine. The best of the measurements is reported.
+    best = dict((preset, {'preset': preset}) for preset in presets)
+    for i in range(repeat):
+        info("measurement %d of %d" % (i + 1, repeat), **kw)
+        for preset in presets:
+            for case, t in measure(workdir, preset, calls).items():
+                best[preset][case] = min(t, best[preset].get(case, t))
+    return [best[preset] for preset in presets]
+
+def report(results):
+    base = results[0]
+    lines = ['%-8s' % 'preset' + ''.join('%18s' % c for c in _cases)]
+    for r in results:
+        cells = []
+        for c in _cases:
+            delta = (r[c] - base[c]) / base[c] * 100.0
+            cells.append('%9.1f (%+5.1f%%)' % (r[c], delta))
+        lines.append('%-8s' % r['preset'] + ''.join(cells))
+    return '\n'.join(lines) + '\n'
+
+# The script...
+_script = os.path.basename(sys.argv[0])
+_scriptabs = os.path.realpath(sys.argv[0])
+_scriptdir = os.path.dirname(_scriptabs)
+_topsrcdir = os.path.realpath(os.path.join(_scriptdir, '..'))
+
+_parser = argparse.ArgumentParser(
+        prog=_script,
+        description="""\
+        This tool builds a small swig module with each of SWIGPY_SWIG_PERF
+        presets and measures the overhead of calling its functions and methods
+        from python. Times are given in nanoseconds per call, the deltas are
+        relative to the first preset.
+        """)
+
+_parser.add_argument('--quiet',
+                      action='store_true',
+                      help='do not print messages')
+_parser.add_argument('--presets',
+                      nargs='+',
+                      default=['none', 'fast', 'small', 'debug'],
+                      help="presets to compare, 'none' stands for no preset "
+                           "(default: none fast small debug)")
+_parser.add_argument('--builtin',
+                      action='store_true',
+                      help='wrap with -builtin (default: python proxy classes)')
+_parser.add_argument('--calls',
+                      type=int,
+                      default=200000,
+                      metavar='N',
+                      help='number of calls per measurement (default: 200000)')
+_parser.add_argument('--repeat',
+                      type=int,
+                      default=5,
+                      metavar='N',
+                      help='number of measurements, the best one is reported (default: 5)')
+_parser.add_argument('--scons',
+                      default=which('scons'),
+                      metavar='PATH',
+                      help='scons script to be used (default: scons found in PATH)')
+_parser.add_argument('--workdir',
+                      metavar='DIR',
+                      help='directory for the generated project (default: temporary directory)')
+_parser.add_argument('--json',
+                      metavar='FILE',
+                      help='write results to FILE as JSON')
+
+_args = _parser.parse_args()
+
+def main():
+    if not _args.scons:
+        sys.stderr.write("%s: error: scons not found, use --scons\n" % _script)
+        return 2
+    scons = [sys.executable, _args.scons]
+    workdir = _args.workdir or tempfile.mkdtemp(prefix='swigpy-perf-')
+    results = []
+    try:
+        info("building presets %s in '%s'" % (', '.join(_args.presets), workdir), quiet=_args.quiet)
+        generate_project(workdir, _args.builtin)
+        build(scons, workdir, _args.presets)
+        results = benchmark(workdir, _args.presets, _args.calls, _args.repeat,
+                            quiet=_args.quiet)
+    finally:
+        if not _args.workdir:
+            shutil.rmtree(workdir)
+    sys.stdout.write(report(results))
+    if _args.json:
+        with open(_args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
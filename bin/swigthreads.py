@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (c) 2014-2020 by Paweł Tomulik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+# Measure throughput of swig wrappers called from many threads, with and
+# without SWIGPY_THREADS
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+try:
+    from shutil import which
+except ImportError:
+    from distutils.spawn import find_executable as which
+
+def info(msg, **kw):
+    try: quiet = kw['quiet']
+    except KeyError: quiet = False
+    if not quiet:
+        sys.stdout.write("%s: info: %s\n" % (_script, msg))
+
+def write_file(path, content):
+    dirname = os.path.dirname(path)
+    if dirname and not os.path.isdir(dirname):
+        os.makedirs(dirname)
+    with open(path, 'w') as f:
+        f.write(content)
+
+_sconstruct = """\
+# SConstruct
+import os
+env = Environment(tools=['default', 'swigpy'], ENV={'PATH': os.environ['PATH']})
+for variant in ['locked', 'threads']:
+    SConscript('src/SConscript', exports=['env', 'variant'],
+               variant_dir=os.path.join('build', variant), duplicate=0)
+"""
+
+_sconscript = """\
+# src/SConscript
+Import(['env', 'variant'])
+env.SwigPyModule('work', SWIGPY_THREADS=(variant == 'threads'))
+"""
+
+_interface = """\
+// src/work.i
+%module work
+%{
+#ifdef _WIN32
+# include <windows.h>
+static void pause_us(int us) { Sleep((us + 999) / 1000); }
+#else
+# include <unistd.h>
+static void pause_us(int us) { usleep(us); }
+#endif
+%}
+%inline %{
+void sleep_us(int us) { pause_us(us); }
+int spin(int n) {
+  volatile int x = 0;
+  int i;
+  for (i = 0; i < n; i++)
+    x += i;
+  return x;
+}
+%}
+"""
+
+# Run by the interpreter the modules were built for, prints calls per second
+# as JSON.
+_timer = """\
+import json, sys, time
+from concurrent.futures import ThreadPoolExecutor
+import work
+(threads, calls, sleep, spin) = [int(arg) for arg in sys.argv[1:]]
+cases = [('sleep', work.sleep_us, sleep),
+         ('spin', work.spin, spin)]
+result = {}
+with ThreadPoolExecutor(threads) as pool:
+    for name, func, arg in cases:
+        t0 = time.time()
+        list(pool.map(func, [arg] * calls))
+        result[name] = calls / (time.time() - t0)
+print(json.dumps(result))
+"""
+
+_variants = ['locked', 'threads']
+_cases = ['sleep', 'spin']
+
+def tool_files():
+    # the tool consists of all the python modules found in the top source directory
+    return [name for name in sorted(os.listdir(_topsrcdir))
+            if name.endswith('.py') and name != 'setup.py']
+
+def generate_project(workdir):
+    if os.path.exists(workdir):
+        shutil.rmtree(workdir)
+    tooldir = os.path.join(workdir, 'site_scons', 'site_tools', 'swigpy')
+    os.makedirs(tooldir)
+    for name in tool_files():
+        shutil.copy(os.path.join(_topsrcdir, name), tooldir)
+    write_file(os.path.join(workdir, 'SConstruct'), _sconstruct)
+    write_file(os.path.join(workdir, 'src', 'SConscript'), _sconscript)
+    write_file(os.path.join(workdir, 'src', 'work.i'), _interface)
+
+def build(scons, workdir):
+    subprocess.check_call(scons + ['-Q'], cwd=workdir, stdout=open(os.devnull, 'w'))
+
+def measure(workdir, variant, threads, calls, sleep, spin):
+    env = dict(os.environ, PYTHONPATH=os.path.join(workdir, 'build', variant))
+    args = [str(x) for x in (threads, calls, sleep, spin)]
+    out = subprocess.check_output([sys.executable, '-c', _timer] + args,
+                                  env=env, universal_newlines=True)
+    return json.loads(out)
+
+def benchmark(workdir, threads, calls, sleep, spin, repeat, **kw):
+    # Variants are measured in turns, so that they're equally affected by
+    # changing load of the machine. The best of the measurements is reported.
+    keys = [(variant, n) for n in threads for variant in _variants]
+    best = dict((key, {'variant': key[0], 'threads': key[1]}) for key in keys)
+    for i in range(repeat):
+        info("measurement %d of %d" % (i + 1, repeat), **kw)
+        for (variant, n) in keys:
+            for case, rate in measure(workdir, variant, n, calls, sleep, spin).items():
+                best[(variant, n)][case] = max(rate, best[(variant, n)].get(case, rate))
+    return [best[key] for key in keys]
+
+def report(results):
+    lines = ['%-8s %8s' % ('variant', 'threads') + ''.join('%14s' % c for c in _cases)]
+    for r in results:
+        lines.append('%-8s %8d' % (r['variant'], r['threads'])
+                     + ''.join('%14.0f' % r[c] for c in _cases))
+    return '\n'.join(lines) + '\n'
+
+# The script...
+_script = os.path.basename(sys.argv[0])
+_scriptabs = os.path.realpath(sys.argv[0])
+_scriptdir = os.path.dirname(_scriptabs)
+_topsrcdir = os.path.realpath(os.path.join(_scriptdir, '..'))
+
+_parser = argparse.ArgumentParser(
+        prog=_script,
+        description="""\
+        This tool builds a small swig module with and without SWIGPY_THREADS
+        and measures the throughput of calling its functions from a pool of
+        python threads. The 'sleep' case waits in C code (as blocking I/O
+        does), the 'spin' case computes. Results are given in calls per
+        second.
+        """)
+
+_parser.add_argument('--quiet',
+                      action='store_true',
+                      help='do not print messages')
+_parser.add_argument('--threads',
+                      type=int,
+                      nargs='+',
+                      default=[1, 4],
+                      metavar='N',
+                      help='sizes of the thread pool to compare (default: 1 4)')
+_parser.add_argument('--calls',
+                      type=int,
+                      default=2000,
+                      metavar='N',
+                      help='number of calls per measurement (default: 2000)')
+_parser.add_argument('--sleep',
+                      type=int,
+                      default=100,
+                      metavar='US',
+                      help="microseconds waited by each call of 'sleep' case (default: 100)")
+_parser.add_argument('--spin',
+                      type=int,
+                      default=100000,
+                      metavar='N',
+                      help="loop iterations of each call of 'spin' case (default: 100000)")
+_parser.add_argument('--repeat',
+                      type=int,
+                      default=3,
+                      metavar='N',
+                      help='number of measurements, the best one is reported (default: 3)')
+_parser.add_argument('--scons',
+                      default=which('scons'),
+                      metavar='PATH',
+                      help='scons script to be used (default: scons found in PATH)')
+_parser.add_argument('--workdir',
+                      metavar='DIR',
+                      help='directory for the generated project (default: temporary directory)')
+_parser.add_argument('--json',
+                      metavar='FILE',
+                      help='write results to FILE as JSON')
+
+_args = _parser.parse_args()
+
+def main():
+    if not _args.scons:
+        sys.stderr.write("%s: error: scons not found, use --scons\n" % _script)
+        return 2
+    scons = [sys.executable, _args.scons]
+    workdir = _args.workdir or tempfile.mkdtemp(prefix='swigpy-threads-')
+    results = []
+    try:
+        info("building in '%s'" % workdir, quiet=_args.quiet)
+        generate_project(workdir)
+        build(scons, workdir)
+        results = benchmark(workdir, _args.threads, _args.calls, _args.sleep, _args.spin,
+                            _args.repeat, quiet=_args.quiet)
+    finally:
+        if not _args.workdir:
+            shutil.rmtree(workdir)
+    sys.stdout.write(report(results))
+    if _args.json:
+        with open(_args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
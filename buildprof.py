@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2014-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+
+# Timing of the actions building swig modules. Records are collected during
+# the build and written when SCons exits: a JSON report with per-module totals
+# and the critical path, the records as CSV and a trace in the Chrome trace
+# event format (chrome://tracing, https://ui.perfetto.dev).
+
+import atexit
+import csv
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+_start = time.time()
+_profiles = {}
+_jobs = {}
+
+_csv_columns = ('module', 'phase', 'target', 'start', 'wall', 'cpu', 'maxrss_kb', 'size', 'job')
+
+def get_profile(path):
+    try:
+        return _profiles[path]
+    except KeyError:
+        if not _profiles:
+            atexit.register(write_profiles)
+        profile = _profiles[path] = []
+        return profile
+
+def now():
+    return time.time() - _start
+
+def thread_cpu_time():
+    # CPU time spent in python by the calling thread (python 3.7+), the
+    # commands run by actions are accounted separately.
+    try:
+        return time.thread_time()
+    except AttributeError:
+        return 0.0
+
+def job_id():
+    # SCons runs each of -j jobs in its own thread.
+    ident = threading.current_thread().ident
+    try:
+        return _jobs[ident]
+    except KeyError:
+        return _jobs.setdefault(ident, len(_jobs))
+
+def measured_spawn(usages):
+    # Replacement of SCons posix spawn, which waits for the command with
+    # wait4(), so resource usage of that very command is known even if other
+    # commands run in parallel.
+    def spawn(sh, escape, cmd, args, env):
+        proc = subprocess.Popen([sh, '-c', ' '.join(args)], env=env, close_fds=True)
+        (_, status, usage) = os.wait4(proc.pid, 0)
+        if os.WIFSIGNALED(status):
+            proc.returncode = -os.WTERMSIG(status)
+        else:
+            proc.returncode = os.WEXITSTATUS(status)
+        usages.append(usage)
+        return proc.returncode
+    return spawn
+
+def maxrss_kb(usage):
+    if sys.platform == 'darwin':
+        return usage.ru_maxrss // 1024
+    return usage.ru_maxrss
+
+def module_of(path):
+    # build/pkg/_foo.cpython-312-x86_64-linux-gnu.so -> build/pkg/foo,
+    # build/pkg/foo_wrap.c -> build/pkg/foo
+    (dirname, name) = os.path.split(path)
+    name = name.split('.')[0]
+    if name.startswith('_'):
+        name = name[1:]
+    if name.endswith('_wrap'):
+        name = name[:-5]
+    return os.path.join(dirname, name).replace(os.sep, '/')
+
+def add_record(profile, phase, targets, sources, start, end, cpu, usages):
+    size = sum(os.path.getsize(t) for t in targets if os.path.isfile(t))
+    if usages is None:
+        (cpu, maxrss) = (None, None)
+    else:
+        cpu += sum(u.ru_utime + u.ru_stime for u in usages)
+        maxrss = max([maxrss_kb(u) for u in usages] or [0])
+    profile.append({'module': module_of(targets[0]),
+                    'phase': phase,
+                    'target': targets[0],
+                    'targets': targets,
+                    'sources': sources,
+                    'start': start,
+                    'wall': end - start,
+                    'cpu': cpu,
+                    'maxrss_kb': maxrss,
+                    'size': size,
+                    'job': job_id()})
+
+def critical_path(records):
+    # Chain of the records, which ends with the last one finished and where
+    # each record is preceded by the latest finished record producing one of
+    # its sources.
+    if not records:
+        return []
+    producers = {}
+    for r in records:
+        for target in r['targets']:
+            producers[target] = r
+    def end(r): return r['start'] + r['wall']
+    record = max(records, key=end)
+    path = [record]
+    seen = set([id(record)])
+    while True:
+        preds = [producers[s] for s in record['sources'] if s in producers]
+        preds = [p for p in preds if id(p) not in seen]
+        if not preds:
+            break
+        record = max(preds, key=end)
+        path.append(record)
+        seen.add(id(record))
+    return list(reversed(path))
+
+def summary(records):
+    modules = {}
+    for r in records:
+        m = modules.setdefault(r['module'], {'module': r['module'], 'wall': 0.0})
+        m[r['phase']] = m.get(r['phase'], 0.0) + r['wall']
+        m['wall'] += r['wall']
+    path = critical_path(records)
+    return {'elapsed': max([r['start'] + r['wall'] for r in records] or [0.0]),
+            'modules': sorted(modules.values(), key=lambda m: -m['wall']),
+            'critical_path': [dict((k, r[k]) for k in ('module', 'phase', 'target', 'wall'))
+                              for r in path],
+            'critical_path_wall': sum(r['wall'] for r in path),
+            'records': sorted(records, key=lambda r: r['start'])}
+
+def trace_events(records):
+    events = [{'name': 'thread_name', 'ph': 'M', 'pid': 0, 'tid': job,
+               'args': {'name': 'job %d' % job}}
+              for job in sorted(set(r['job'] for r in records))]
+    for r in records:
+        events.append({'name': r['target'], 'cat': r['phase'], 'ph': 'X', 'pid': 0,
+                       'tid': r['job'], 'ts': int(r['start'] * 1e6), 'dur': int(r['wall'] * 1e6),
+                       'args': dict((k, r[k]) for k in ('module', 'cpu', 'maxrss_kb', 'size'))})
+    return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+def write_profile(path, records):
+    # path.json, path.csv and path.trace.json
+    base = os.path.splitext(path)[0]
+    with open(path, 'w') as f:
+        json.dump(summary(records), f, indent=2)
+    with open(base + '.csv', 'w') as f:
+        writer = csv.writer(f)
+        writer.writerow(_csv_columns)
+        for r in sorted(records, key=lambda r: r['start']):
+            writer.writerow([r[c] for c in _csv_columns])
+    with open(base + '.trace.json', 'w') as f:
+        json.dump(trace_events(records), f)
+
+def write_profiles():
+    # Nothing is written if nothing was built, so that a report isn't
+    # overwritten by a null build.
+    for path, records in _profiles.items():
+        if records:
+            write_profile(path, records)
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2014-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+
+
+# Hit rate of the compiler cache (ccache, sccache) used to compile the
+# wrappers. Statistics of the cache are taken before the first compilation
+# and when SCons exits, the difference is reported.
+
+import atexit
+import json
+import os
+import subprocess
+import sys
+import threading
+
+_watched = {}
+_lock = threading.Lock()
+
+def is_sccache(cache):
+    return 'sccache' in os.path.basename(cache).lower()
+
+def cache_stats(cache, environ):
+    # Returns (hits, misses) counted by cache so far, None if unknown.
+    try:
+        with open(os.devnull, 'w') as devnull:
+            if is_sccache(cache):
+                out = subprocess.check_output([cache, '--show-stats', '--stats-format=json'],
+                                              env=environ, stderr=devnull, universal_newlines=True)
+                stats = json.loads(out)['stats']
+                return (sum(stats['cache_hits']['counts'].values()),
+                        sum(stats['cache_misses']['counts'].values()))
+            out = subprocess.check_output([cache, '--print-stats'],
+                                          env=environ, stderr=devnull, universal_newlines=True)
+    except (OSError, subprocess.CalledProcessError, ValueError, KeyError, TypeError):
+        return None
+    values = dict(line.split('\t', 1) for line in out.splitlines() if '\t' in line)
+    try:
+        return (int(values.get('direct_cache_hit', 0)) + int(values.get('preprocessed_cache_hit', 0)),
+                int(values.get('cache_miss', 0)))
+    except ValueError:
+        return None
+
+def watch(cache, environ):
+    # Called (from any of -j jobs) before compiling with cache.
+    with _lock:
+        if cache in _watched:
+            return
+        if not _watched:
+            atexit.register(report)
+        _watched[cache] = (environ, cache_stats(cache, environ))
+
+def report(out=None):
+    out = out or sys.stdout
+    for cache, (environ, before) in sorted(_watched.items()):
+        after = cache_stats(cache, environ)
+        if before is None or after is None:
+            continue
+        (hits, misses) = (after[0] - before[0], after[1] - before[1])
+        if hits + misses > 0:
+            out.write("swigpy: %s: %d hits, %d misses (%.0f%% hit rate)\n"
+                      % (os.path.basename(cache), hits, misses, 100.0 * hits / (hits + misses)))
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
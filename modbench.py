@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2014-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+
+# Benchmark of built modules: import latency, memory taken by the import and
+# call overhead, measured in fresh interpreters.
+
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+
+metrics = ('import_cold_ms', 'import_warm_ms', 'call_ns', 'rss_kb')
+
+# Run by the benchmarked interpreter, prints the measurements as JSON.
+_probe = """\
+import importlib, json, os, sys, time, timeit
+clock = getattr(time, 'perf_counter', time.time)
+def rss_kb():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (IOError, OSError, ValueError, AttributeError):
+        return None
+(name, calls, stmt) = (sys.argv[1], int(sys.argv[2]), sys.argv[3])
+rss0 = rss_kb()
+t0 = clock()
+importlib.import_module(name)
+t1 = clock()
+rss1 = rss_kb()
+result = {'import_ms': (t1 - t0) * 1e3, 'rss_kb': None, 'call_ns': None}
+if rss0 is not None and rss1 is not None:
+    result['rss_kb'] = rss1 - rss0
+if stmt:
+    timer = timeit.Timer(stmt, 'import importlib; m = importlib.import_module(%r)' % name)
+    result['call_ns'] = min(timer.repeat(3, calls)) / calls * 1e9
+print(json.dumps(result))
+"""
+
+def _run_probe(python, name, calls, stmt, environ, cwd):
+    out = subprocess.check_output([python, '-c', _probe, name, str(calls), stmt or ''],
+                                  env=environ, cwd=cwd, universal_newlines=True)
+    return json.loads(out.strip().splitlines()[-1])
+
+def _best(values):
+    values = [v for v in values if v is not None]
+    return min(values) if values else None
+
+def bench_module(python, name, path, environ, calls=100000, repeat=5, stmt=None):
+    # Cold imports start with an empty bytecode cache (PYTHONPYCACHEPREFIX,
+    # python 3.8+), so compilation of the proxy modules is included. Warm
+    # imports share a cache filled by a preceding import. The best of repeat
+    # runs is taken.
+    environ = dict(environ, PYTHONPATH=os.pathsep.join(path))
+    cachedir = tempfile.mkdtemp(prefix='swigpy-bench-')
+    try:
+        cold = []
+        for i in range(repeat):
+            prefix = os.path.join(cachedir, 'cold%d' % i)
+            cold.append(_run_probe(python, name, calls, None,
+                                   dict(environ, PYTHONPYCACHEPREFIX=prefix), path[0]))
+        warm_environ = dict(environ, PYTHONPYCACHEPREFIX=os.path.join(cachedir, 'warm'))
+        _run_probe(python, name, 1, None, warm_environ, path[0])
+        warm = [_run_probe(python, name, calls, stmt, warm_environ, path[0])
+                for i in range(repeat)]
+    finally:
+        shutil.rmtree(cachedir, ignore_errors=True)
+    return {'import_cold_ms': _best(r['import_ms'] for r in cold),
+            'import_warm_ms': _best(r['import_ms'] for r in warm),
+            'call_ns': _best(r['call_ns'] for r in warm),
+            'rss_kb': _best(r['rss_kb'] for r in cold)}
+
+def load_results(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+
+def save_results(path, results):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+def regressions(old, new, threshold):
+    # Measurements of new worse than those of old by more than threshold
+    # (relative, 0.1 stands for 10%).
+    found = []
+    for name, result in sorted(new['modules'].items()):
+        base = old.get('modules', {}).get(name, {})
+        for metric in metrics:
+            (a, b) = (base.get(metric), result.get(metric))
+            if a is not None and b is not None and a > 0 and b > a * (1.0 + threshold):
+                found.append((name, metric, a, b))
+    return found
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2014-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+# Source generators for extensions bundling several swig modules in a single
+# shared object. The shared object is a "container" module whose init
+# function initializes all the bundled (part) modules and registers them in
+# sys.modules, next to the container, such that the swig-generated proxies
+# find their low-level modules as usual.
+
+_c_template = """\
+/* Generated by swigpy, do not edit. */
+#include <Python.h>
+
+#if PY_VERSION_HEX < 0x03050000
+# error "modules bundled by swigpy require python 3.5 or later"
+#endif
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+%(declarations)s
+#ifdef __cplusplus
+}
+#endif
+
+static PyObject *(*const swigpy_part_inits[])(void) = {
+%(inits)s
+};
+
+static const char *const swigpy_part_names[] = {
+%(names)s
+};
+
+static PyObject *swigpy_init_part(PyObject *(*init)(void), PyObject *spec)
+{
+  PyObject *module = init();
+  if (module != NULL && PyObject_TypeCheck(module, &PyModuleDef_Type)) {
+    /* multi-phase initialization */
+    PyModuleDef *def = (PyModuleDef *)module;
+    module = PyModule_FromDefAndSpec(def, spec);
+    if (module != NULL && PyModule_ExecDef(module, def) < 0) {
+      Py_DECREF(module);
+      module = NULL;
+    }
+  }
+  return module;
+}
+
+static int swigpy_exec(PyObject *container)
+{
+  PyObject *modules = PyImport_GetModuleDict();
+  PyObject *machinery = NULL, *name = NULL, *parts = NULL, *prefix = NULL;
+  PyObject *file = NULL;
+  size_t i;
+  int result = -1;
+
+  machinery = PyImport_ImportModule("importlib.machinery");
+  if (machinery == NULL)
+    goto done;
+  name = PyObject_GetAttrString(container, "__name__");
+  if (name == NULL)
+    goto done;
+  /* "pkg._container" -> "pkg." */
+  parts = PyObject_CallMethod(name, "rpartition", "s", ".");
+  if (parts == NULL)
+    goto done;
+  prefix = PyUnicode_Concat(PyTuple_GetItem(parts, 0), PyTuple_GetItem(parts, 1));
+  if (prefix == NULL)
+    goto done;
+  file = PyObject_GetAttrString(container, "__file__");
+  if (file == NULL)
+    PyErr_Clear();
+
+  for (i = 0; i < sizeof(swigpy_part_inits) / sizeof(swigpy_part_inits[0]); ++i) {
+    PyObject *part_name, *spec, *module;
+    part_name = PyUnicode_FromFormat("%%U%%s", prefix, swigpy_part_names[i]);
+    if (part_name == NULL)
+      goto done;
+    spec = PyObject_CallMethod(machinery, "ModuleSpec", "OO", part_name, Py_None);
+    if (spec == NULL) {
+      Py_DECREF(part_name);
+      goto done;
+    }
+    module = swigpy_init_part(swigpy_part_inits[i], spec);
+    Py_DECREF(spec);
+    if (module == NULL || PyDict_SetItem(modules, part_name, module) < 0) {
+      Py_XDECREF(module);
+      Py_DECREF(part_name);
+      goto done;
+    }
+    Py_DECREF(part_name);
+    if (file != NULL && PyObject_SetAttrString(module, "__file__", file) < 0)
+      PyErr_Clear();
+    if (PyModule_AddObject(container, swigpy_part_names[i], module) < 0) {
+      Py_DECREF(module);
+      goto done;
+    }
+  }
+  result = 0;
+done:
+  Py_XDECREF(file);
+  Py_XDECREF(prefix);
+  Py_XDECREF(parts);
+  Py_XDECREF(name);
+  Py_XDECREF(machinery);
+  return result;
+}
+
+static PyModuleDef_Slot swigpy_slots[] = {
+  {Py_mod_exec, (void *)swigpy_exec},
+#if defined(SWIGPY_NOGIL) && defined(Py_GIL_DISABLED)
+  {Py_mod_gil, Py_MOD_GIL_NOT_USED},
+#endif
+  {0, NULL}
+};
+
+static struct PyModuleDef swigpy_module = {
+  PyModuleDef_HEAD_INIT,
+  "%(container)s",
+  NULL,
+  0,
+  NULL,
+  swigpy_slots,
+  NULL,
+  NULL,
+  NULL
+};
+
+/* Keep the init function visible when compiling with -fvisibility=hidden,
+ * PyMODINIT_FUNC does it since python 3.9 only. */
+#if !defined(_WIN32) && !defined(__CYGWIN__) && defined(__GNUC__)
+# define SWIGPY_EXPORT __attribute__ ((visibility("default")))
+#else
+# define SWIGPY_EXPORT
+#endif
+
+#ifdef __cplusplus
+extern "C"
+#endif
+SWIGPY_EXPORT PyMODINIT_FUNC PyInit_%(container)s(void)
+{
+  return PyModuleDef_Init(&swigpy_module);
+}
+"""
+
+_py_template = """\
+# Generated by swigpy, do not edit.
+if __package__ or '.' in __name__:
+    from . import %(container)s
+%(relative_imports)s
+else:
+    import %(container)s
+%(absolute_imports)s
+"""
+
+_shim_py_template = """\
+# Generated by swigpy, do not edit.
+# Loading the container replaces this module in sys.modules with the
+# low-level module of the same name bundled in the container.
+if __package__ or '.' in __name__:
+    from . import %(container)s
+else:
+    import %(container)s
+"""
+
+
+def multi_init_c_source(container, parts):
+    # C source of the container module (named container) which initializes
+    # the low-level modules named parts (e.g. _foo for swig module foo).
+    return _c_template % {
+        'container': container,
+        'declarations': '\n'.join('PyObject *PyInit_%s(void);' % p for p in parts),
+        'inits': ',\n'.join('  PyInit_%s' % p for p in parts),
+        'names': ',\n'.join('  "%s"' % p for p in parts),
+    }
+
+
+def facade_py_source(container, modules):
+    # Python module which loads the container and re-exports all the names
+    # from the swig-generated proxy modules.
+    return _py_template % {
+        'container': container,
+        'relative_imports': '\n'.join('    from .%s import *' % m for m in modules),
+        'absolute_imports': '\n'.join('    from %s import *' % m for m in modules),
+    }
+
+
+def shim_py_source(container):
+    # Python module standing for a low-level module bundled in container.
+    return _shim_py_template % {'container': container}
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
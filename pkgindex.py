@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2014-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+
+# Discovery of swig modules in a directory tree. The result of scanning each
+# directory may be kept in an index file, keyed on directory's mtime and the
+# mtimes and sizes of its interface files, so that only the directories
+# changed since the last scan are listed again and the interface files are
+# not read. Checking the index still takes a stat() per directory and per
+# interface file: editing a file in place (e.g. adding or removing %module)
+# changes neither the mtime of its directory nor the list of its entries, and
+# the stat() of the file is the cheapest way to notice it.
+
+import os
+import re
+
+from .pyconf import load_json_cache, save_json_cache
+
+_module_re = re.compile(r'^\s*%module\b', re.M)
+
+def is_swig_module(path):
+    # Interface files without %module are assumed to be %include'd by others.
+    try:
+        with open(path) as f:
+            return bool(_module_re.search(f.read()))
+    except (IOError, OSError, ValueError):
+        return False
+
+def file_stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime, st.st_size]
+
+def scan_dir(path):
+    # Returns subdirectories, modules and stamps of all the interface files
+    # (editing a file in place doesn't change the mtime of its directory).
+    subdirs = []
+    modules = []
+    stamps = []
+    for name in sorted(os.listdir(path)):
+        if name.startswith('.'):
+            continue
+        full = os.path.join(path, name)
+        if os.path.isdir(full):
+            subdirs.append(name)
+        elif name.endswith('.i'):
+            stamp = file_stamp(full)
+            if stamp is None:
+                continue
+            stamps.append([name] + stamp)
+            if is_swig_module(full):
+                modules.append(name)
+    return (subdirs, modules, stamps)
+
+def is_up_to_date(path, mtime, entry):
+    # The directory mtime covers added, removed and renamed entries, the
+    # stamps cover interface files edited in place.
+    if not (isinstance(entry, list) and len(entry) == 4 and entry[0] == mtime):
+        return False
+    return all(file_stamp(os.path.join(path, stamp[0])) == stamp[1:] for stamp in entry[3])
+
+def find_swig_modules(root, index_file=None):
+    # Returns paths (relative to root) of the interface files defining swig
+    # modules found in the tree rooted at root.
+    root = os.path.abspath(root)
+    index = load_json_cache(index_file) if index_file else {}
+    dirty = False
+    visited = set()
+    result = []
+    stack = ['']
+    while stack:
+        rel = stack.pop()
+        path = os.path.join(root, rel) if rel else root
+        visited.add(path)
+        mtime = os.path.getmtime(path)
+        entry = index.get(path)
+        if not is_up_to_date(path, mtime, entry):
+            entry = index[path] = [mtime] + list(scan_dir(path))
+            dirty = True
+        result.extend(os.path.join(rel, name) for name in entry[2])
+        stack.extend(os.path.join(rel, name) for name in reversed(entry[1]))
+    # Forget directories removed from the tree.
+    for path in list(index):
+        if path not in visited and (path + os.sep).startswith(root + os.sep):
+            del index[path]
+            dirty = True
+    if index_file and dirty:
+        save_json_cache(index_file, index)
+    return sorted(result)
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
@@ -24,15 +24,21 @@ import sysconfig
 import json
 import os
 import sys
+import subprocess
 
 def python_inc_path():
     return sysconfig.get_config_var('INCLUDEPY')
 
+def python_gil_disabled():
+    return bool(sysconfig.get_config_var('Py_GIL_DISABLED'))
+
 def python_lib_name():
     libfile = sysconfig.get_config_var('LDLIBRARY')
     if libfile and libfile.startswith('lib') and libfile.endswith('.so'):
         return libfile[3:-3]
-    return 'python' + str(sysconfig.get_config_var('VERSION'))
+    # libpython3.13t.a of the free-threaded build
+    suffix = 't' if python_gil_disabled() else ''
+    return 'python' + str(sysconfig.get_config_var('VERSION')) + suffix
 
 def python_lib_dir():
     if sysconfig.get_platform() in ['win32', 'win-amd64']:
@@ -41,10 +47,146 @@ def python_lib_dir():
     else:
         return sysconfig.get_config_var('LIBPL')
 
-def get_py_config():
+def python_abi3_lib_name():
+    # The stable ABI library (python3.dll, libpython3.so) is only available
+    # on Windows and in shared builds of python. The free-threaded build has
+    # no stable ABI.
+    if python_gil_disabled():
+        return None
+    if sysconfig.get_platform() in ['win32', 'win-amd64']:
+        return 'python3'
+    if sysconfig.get_config_var('Py_ENABLE_SHARED'):
+        return 'python3'
+    return None
+
+def python_abi3_lib_dir():
+    if sysconfig.get_platform() in ['win32', 'win-amd64']:
+        return python_lib_dir()
+    if sysconfig.get_config_var('Py_ENABLE_SHARED'):
+        return sysconfig.get_config_var('LIBDIR')
+    return python_lib_dir()
+
+def python_ext_suffix():
+    # '.cpython-313t-x86_64-linux-gnu.so', python 2 has no EXT_SUFFIX
+    return sysconfig.get_config_var('EXT_SUFFIX') or sysconfig.get_config_var('SO')
+
+def python_abi_tag():
+    impl = getattr(sys, 'implementation', None)
+    tag = getattr(impl, 'cache_tag', None) or 'python%d%d' % sys.version_info[:2]
+    return tag + getattr(sys, 'abiflags', '')
+
+def python_identity(python=None):
+    # Identifies an interpreter without running it, so that the identity may
+    # be used as a key to look up the cached configuration. The ABI tag is
+    # only known for the interpreter running this code.
+    exe = os.path.realpath(sys.executable if python is None else python)
+    try:
+        mtime = os.path.getmtime(exe)
+    except OSError:
+        mtime = None
+    if exe == os.path.realpath(sys.executable):
+        return (exe, mtime, python_abi_tag())
+    return (exe, mtime, None)
+
+def load_json_cache(path):
+    try:
+        with open(path) as f:
+            cache = json.load(f)
+    except (IOError, OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+def save_json_cache(path, cache):
+    tmp = '%s.%d.tmp' % (path, os.getpid())
+    try:
+        with open(tmp, 'w') as f:
+            json.dump(cache, f, indent=2, sort_keys=True)
+        if os.path.exists(path) and sys.platform == 'win32':
+            os.remove(path)
+        os.rename(tmp, path)
+    except (IOError, OSError):
+        # The cache is an optimization only, failing to write it is harmless.
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+py_config_vars = ('SWIGPY_PYTHONINCDIR',
+                  'SWIGPY_PYTHONLIBDIR',
+                  'SWIGPY_PYTHONLIB',
+                  'SWIGPY_PYTHONABI3LIBDIR',
+                  'SWIGPY_PYTHONABI3LIB',
+                  'SWIGPY_PYTHONTAG',
+                  'SWIGPY_PYTHONEXTSUFFIX',
+                  'SWIGPY_PYTHONGILDISABLED')
+
+def _compute_py_config():
     return {'SWIGPY_PYTHONINCDIR': python_inc_path(),
             'SWIGPY_PYTHONLIBDIR': python_lib_dir(),
-            'SWIGPY_PYTHONLIB': python_lib_name()}
+            'SWIGPY_PYTHONLIB': python_lib_name(),
+            'SWIGPY_PYTHONABI3LIBDIR': python_abi3_lib_dir(),
+            'SWIGPY_PYTHONABI3LIB': python_abi3_lib_name(),
+            'SWIGPY_PYTHONTAG': python_abi_tag(),
+            'SWIGPY_PYTHONEXTSUFFIX': python_ext_suffix(),
+            'SWIGPY_PYTHONGILDISABLED': python_gil_disabled()}
+
+def _is_py_config(config):
+    # Entries written by older versions may lack some of the variables.
+    return isinstance(config, dict) and all(k in config for k in py_config_vars)
+
+def probe_py_configs(pythons):
+    # Runs this script under each of the given interpreters and collects the
+    # JSON they print. The probes run concurrently.
+    script = os.path.splitext(os.path.abspath(__file__))[0] + '.py'
+    procs = []
+    for python in pythons:
+        proc = subprocess.Popen([python, script], stdout=subprocess.PIPE,
+                                universal_newlines=True)
+        procs.append((python, proc))
+    configs = []
+    for python, proc in procs:
+        out = proc.communicate()[0]
+        if proc.returncode != 0:
+            raise RuntimeError('%s %s exited with status %d' %
+                               (python, script, proc.returncode))
+        configs.append(json.loads(out))
+    return configs
+
+_py_config_memo = {}
+
+def get_py_configs(pythons, cache_file=None):
+    # Returns configurations of several interpreters, None stands for the
+    # interpreter running this code. Results are memoized per interpreter for
+    # the lifetime of the process. If cache_file is given, they're also
+    # persisted in that JSON file, keyed on interpreter's identity. Foreign
+    # interpreters missing in both caches are probed in a single batch.
+    identities = [python_identity(python) for python in pythons]
+    if all(identity in _py_config_memo for identity in identities):
+        return [dict(_py_config_memo[identity]) for identity in identities]
+    cache = load_json_cache(cache_file) if cache_file else {}
+    dirty = False
+    missing = {}
+    for identity, python in zip(identities, pythons):
+        if identity in _py_config_memo:
+            continue
+        key = json.dumps(identity)
+        if _is_py_config(cache.get(key)):
+            _py_config_memo[identity] = cache[key]
+        elif identity[2] is not None:
+            _py_config_memo[identity] = cache[key] = _compute_py_config()
+            dirty = True
+        else:
+            missing.setdefault(identity, python)
+    if missing:
+        missing = list(missing.items())
+        configs = probe_py_configs([python for _, python in missing])
+        for (identity, _), config in zip(missing, configs):
+            _py_config_memo[identity] = cache[json.dumps(identity)] = config
+        dirty = True
+    if cache_file and dirty:
+        save_json_cache(cache_file, cache)
+    return [dict(_py_config_memo[identity]) for identity in identities]
+
+def get_py_config(cache_file=None, python=None):
+    return get_py_configs([python], cache_file)[0]
 
 
 if __name__ == '__main__':
@@ -43,7 +43,9 @@ class develop(setuptools.command.develop.develop):
                         'broken "pip install -e ."')
 
     def run(self, *args, **kw):
-        self._make_symlinks(['__init__.py', 'about.py'])
+        self._make_symlinks(['__init__.py', 'about.py', 'pyconf.py', 'multimod.py',
+                             'swigdeps.py', 'pkgindex.py', 'buildprof.py', 'modbench.py',
+                             'compcache.py'])
         setuptools.command.develop.develop.run(self, *args, **kw)
 
 
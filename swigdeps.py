@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2014-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+
+# Persistent database of swig dependencies. Entries come from the dependency
+# files written by swig (-MMD -MF) while generating the wrappers, so that the
+# interface files needn't be scanned again in subsequent builds.
+
+import atexit
+import re
+
+from .pyconf import load_json_cache, save_json_cache
+
+def parse_depfile(text):
+    # Returns the prerequisites listed in a makefile rule written by swig.
+    text = text.replace('\\\r\n', ' ').replace('\\\n', ' ')
+    rule = re.split(r':(?:\s|$)', text, 1)
+    if len(rule) < 2:
+        return []
+    deps = re.split(r'(?<!\\)\s+', rule[1].strip())
+    return [dep.replace('\\ ', ' ') for dep in deps if dep]
+
+_dep_dbs = {}
+_dirty_dep_dbs = set()
+
+def load_dep_db(path):
+    try:
+        return _dep_dbs[path]
+    except KeyError:
+        if not _dep_dbs:
+            atexit.register(save_dep_dbs)
+        db = _dep_dbs[path] = load_json_cache(path)
+        return db
+
+def update_dep_db(path, key, deps):
+    db = load_dep_db(path)
+    if db.get(key) != deps:
+        db[key] = deps
+        _dirty_dep_dbs.add(path)
+
+def save_dep_dbs():
+    while _dirty_dep_dbs:
+        path = _dirty_dep_dbs.pop()
+        save_json_cache(path, _dep_dbs[path])
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
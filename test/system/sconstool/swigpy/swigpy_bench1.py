@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2014-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+__docformat__ = "restructuredText"
+
+"""
+Test benchmarking of built modules (SwigPyBench)
+"""
+
+from swigpytest import swigpy_test, _python_, _env_args_
+
+test = swigpy_test()
+
+test.subdir(['src'])
+
+test.write('SConstruct', """\
+# SConstruct
+import os
+env = Environment( %(_env_args_)s )
+SConscript('src/SConscript', exports=['env'], variant_dir='build', duplicate=0)
+""" % locals())
+
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+env.SwigPyModule('calc')
+env.SwigPyBench('calc', SWIGPY_BENCH_CALL = 'm.add(1, 2)', SWIGPY_BENCH_REPEAT = 2,
+                SWIGPY_BENCH_CALLS = 1000)
+""")
+
+test.write('src/calc.i', """\
+// src/calc.i
+%module calc
+%inline %{
+int add(int a, int b) { return a + b; }
+%}
+""")
+
+# The benchmark is not a default target.
+test.run()
+test.must_exist('build/calc.py')
+test.must_not_exist('build/swigpy_bench.json')
+
+test.run(arguments = 'swigpy-bench')
+test.must_exist('build/swigpy_bench.json')
+
+test.write('check.py', """\
+import json
+results = json.load(open('build/swigpy_bench.json'))
+calc = results['modules']['calc']
+print(sorted(calc))
+print(calc['import_cold_ms'] > 0 and calc['import_warm_ms'] > 0 and calc['call_ns'] > 0)
+""")
+test.run(program='check.py', interpreter=_python_,
+         stdout="['call_ns', 'import_cold_ms', 'import_warm_ms', 'rss_kb']\nTrue\n")
+
+test.up_to_date(arguments = 'swigpy-bench')
+
+
+test.pass_test()
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
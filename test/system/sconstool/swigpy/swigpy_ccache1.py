@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2014-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+__docformat__ = "restructuredText"
+
+"""
+Test compiling the wrappers through ccache (SWIGPY_COMPILER_CACHE)
+"""
+
+import os
+import shutil
+import TestCmd
+from swigpytest import swigpy_test, _env_args_, _ext
+
+test = swigpy_test()
+
+if not TestCmd.where_is('ccache'):
+    test.skip_test("ccache not found, skipping test\n")
+
+# private cache of the test
+os.environ['CCACHE_DIR'] = test.workpath('ccache')
+
+test.subdir(['src'])
+
+test.write('SConstruct', """\
+# SConstruct
+import os
+env = Environment( %(_env_args_)s, SWIGPY_COMPILER_CACHE = 'ccache' )
+env['ENV']['CCACHE_DIR'] = os.environ['CCACHE_DIR']
+SConscript('src/SConscript', exports=['env'], variant_dir='build', duplicate=0)
+""" % locals())
+
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+env.SwigPyModule('hello')
+""")
+
+test.write('src/hello.i', """\
+// src/hello.i
+%module hello
+%inline %{
+int hello(int x) { return x + 1; }
+%}
+""")
+
+test.run()
+test.must_exist('build/_hello%(_ext)s' % locals())
+test.must_contain_all_lines(test.stdout(), ['swigpy: ccache: 0 hits, 1 misses'])
+
+test.up_to_date(arguments = '.')
+
+# The wrapper comes from the cache after cleaning.
+test.run(arguments=['-c'])
+test.run()
+test.must_exist('build/_hello%(_ext)s' % locals())
+test.must_contain_all_lines(test.stdout(), ['swigpy: ccache: 1 hits, 0 misses'])
+
+# A dry run doesn't look at the cache statistics.
+test.write('src/hello.i', """\
+// src/hello.i
+%module hello
+%inline %{
+int hello(int x) { return x + 2; }
+%}
+""")
+test.run(arguments=['-n'])
+test.fail_test('swigpy: ccache' in test.stdout())
+
+# The location of the checkout is not a part of the signatures.
+test.run()
+test.subdir(['moved'])
+for name in ['site_scons', 'src', 'build']:
+    shutil.copytree(test.workpath(name), test.workpath('moved', name))
+for name in ['SConstruct', '.sconsign.dblite']:
+    shutil.copy(test.workpath(name), test.workpath('moved', name))
+test.up_to_date(chdir = 'moved', arguments = '.')
+
+
+test.pass_test()
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
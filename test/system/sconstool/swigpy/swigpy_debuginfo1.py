@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2014-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+__docformat__ = "restructuredText"
+
+"""
+Test splitting debug info off the extensions (SWIGPY_DEBUGINFO)
+"""
+
+import sys
+import os
+import TestCmd
+from swigpytest import swigpy_test, _env_args_, _swigpy_python_, _ext
+
+test = swigpy_test()
+
+if sys.platform in ('win32', 'darwin') or not TestCmd.where_is('objcopy'):
+    test.skip_test("objcopy not available, skipping test\n")
+
+test.subdir(['src'])
+
+test.write('SConstruct', """\
+# SConstruct
+import os
+env = Environment( %(_env_args_)s, SWIGPY_CCFLAGS = ['-g'], SWIGPY_DEBUGINFO = 'split' )
+SConscript('src/SConscript', exports=['env'], variant_dir='build', duplicate=0)
+""" % locals())
+
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+env.SwigPyModule('hello')
+env.SwigPyModule('world', SWIGPY_DEBUGINFO = 'strip')
+""")
+
+test.write('src/hello.i', """\
+// src/hello.i
+%module hello
+%inline %{
+int hello(int x) { return x + 1; }
+%}
+""")
+
+test.write('src/world.i', """\
+// src/world.i
+%module world
+%inline %{
+int world(int x) { return x + 2; }
+%}
+""")
+
+test.run()
+
+test.must_exist('build/_hello%(_ext)s' % locals())
+test.must_exist('build/_hello%(_ext)s.debug' % locals())
+test.must_exist('build/_world%(_ext)s' % locals())
+test.must_not_exist('build/_world%(_ext)s.debug' % locals())
+
+test.up_to_date(arguments = '.')
+
+# The debug info is gone from the extensions, hello refers to its side file.
+readelf = TestCmd.where_is('readelf')
+if readelf is not None:
+    for name in ('hello', 'world'):
+        sections = os.popen('%s -S %s' % (readelf, test.workpath('build/_%s%s' % (name, _ext)))).read()
+        test.fail_test('.debug_info' in sections)
+        test.fail_test(('.gnu_debuglink' in sections) != (name == 'hello'))
+
+test.write('build/test.py', """\
+#!%(_swigpy_python_)s
+import hello, world
+print('%%d %%d' %% (hello.hello(1), world.world(1)))
+""" % locals())
+
+os.environ['PYTHONPATH'] = test.workpath('build')
+test.run(chdir='build', program='test.py', interpreter=_swigpy_python_, stdout='2 3\n', stderr=None)
+
+
+test.pass_test()
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
@@ -28,69 +28,9 @@ Test example from README.rst
 
 import sys
 import os
-import sysconfig
-import subprocess
-import TestSCons
-import TestCmd
+from swigpytest import swigpy_test, _dll, dll_, _env_args_, _swigpy_python_, _ext
 
-_dll = TestSCons._dll
-dll_ = TestSCons.dll_
-_python_ = TestSCons._python_
-
-
-if sys.platform == 'win32':
-    _ext = '.pyd'
-else:
-    _ext = _dll
-
-
-_scons_ = TestCmd.where_is('scons')
-if _scons_ is not None:
-    # Find the actual scons Python script. We believe that the scons found
-    # withing PATH is the one installed for our _python_.
-    if _scons_[-4:].upper() in ['.BAT']:
-        # On win32 the python script is found alongside with the .BAT script.
-        # where_is() returns 'scons.BAT', so we need to strip out the extension.
-        _scons_ = _scons_[:-4]
-    test = TestSCons.TestSCons(program=_scons_, interpreter=_python_)
-else:
-    test = TestSCons.TestSCons(interpreter=_python_)
-
-
-test.subdir(['site_scons'])
-test.subdir(['site_scons', 'site_tools'])
-test.subdir(['site_scons', 'site_tools', 'swigpy'])
-test.file_fixture('../../../../__init__.py','site_scons/site_tools/swigpy/__init__.py')
-test.file_fixture('../../../../about.py','site_scons/site_tools/swigpy/about.py')
-test.file_fixture('../../../../pyconf.py','site_scons/site_tools/swigpy/pyconf.py')
-
-
-if sysconfig.get_platform().startswith('mingw'):
-    # Set 'mingw' tool, because 'default' prefers MS Visual C Compiler
-    _tools_ = r"['mingw', 'swigpy']"
-else:
-    _tools_ = r"['default', 'swigpy']"
-
-_path_ = os.environ['PATH']
-if sys.platform == 'win32':
-    _env_args_ = "tools=%(_tools_)s, ENV={'TEMP':'.', 'PATH': r%(_path_)r}" % locals()
-else:
-    _env_args_ = "tools=%(_tools_)s" % locals()
-
-# support compiling and testing against custom python interpreter (other than the one running this script).
-
-_swigpy_python_ = os.environ.get('SWIGPY_PYTHON', _python_)
-
-try:
-    _swigpy_pyconf_ = os.environ['SWIGPY_PYCONF']
-except KeyError:
-    if _swigpy_python_ != _python_:
-        _swigpy_pyconf_ = subprocess.check_output([_swigpy_python_, 'site_scons/site_tools/swigpy/pyconf.py'], universal_newlines=True)
-    else:
-        _swigpy_pyconf_ = None
-
-if _swigpy_pyconf_ is not None:
-    _env_args_ = _env_args_ + ', **%(_swigpy_pyconf_)s' % locals()
+test = swigpy_test()
 
 test.subdir(['src'])
 
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2014-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+__docformat__ = "restructuredText"
+
+"""
+Test building modules against the stable ABI (SWIGPY_LIMITED_API)
+"""
+
+import sys
+import os
+from swigpytest import swigpy_test, _env_args_, _swigpy_python_
+
+test = swigpy_test()
+
+if sys.platform == 'win32':
+    test.skip_test("stable ABI extensions are .pyd on Windows, skipping test\n")
+
+_version = os.popen('%s -c "import sys; print(sys.version_info[0] * 100 + sys.version_info[1])"'
+                    % _swigpy_python_).read().strip()
+if int(_version) < 308:
+    test.skip_test("python 3.8 or later required, skipping test\n")
+
+test.subdir(['src'])
+
+test.write('SConstruct', """\
+# SConstruct
+import os
+env = Environment( %(_env_args_)s, SWIGPY_LIMITED_API = '3.8',
+                   SWIGPY_CPPDEFINES = ['Py_LIMITED_API=0x03020000'] )
+SConscript('src/SConscript', exports=['env'], variant_dir='build', duplicate=0)
+""" % locals())
+
+# -builtin given in the call is dropped, -threads of SWIGPY_THREADS is kept
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+env.SwigPyModule('hello', SWIGPY_SWIGFLAGS = ['-python', '-builtin'], SWIGPY_THREADS = True)
+""")
+
+test.write('src/hello.i', """\
+// src/hello.i
+%module hello
+%inline %{
+int hello(int x) { return x + 1; }
+%}
+""")
+
+test.run()
+
+test.must_exist('build/_hello.abi3.so')
+lines = test.stdout().splitlines()
+swig = [l.split() for l in lines if l.endswith('hello.i')]
+compile = [l.split() for l in lines if ' -c ' in l and 'hello_wrap' in l]
+test.fail_test(len(swig) != 1 or len(compile) != 1)
+test.fail_test('-builtin' in swig[0] or '-threads' not in swig[0])
+test.fail_test([f for f in compile[0] if 'Py_LIMITED_API' in f] != ['-DPy_LIMITED_API=0x03080000'])
+
+test.up_to_date(arguments = '.')
+
+test.write('build/test.py', """\
+#!%(_swigpy_python_)s
+import hello
+print(hello.hello(1))
+print(hello._hello.__file__.endswith('.abi3.so'))
+""" % locals())
+
+os.environ['PYTHONPATH'] = test.workpath('build')
+test.run(chdir='build', program='test.py', interpreter=_swigpy_python_, stdout='2\nTrue\n', stderr=None)
+
+# swig older than 4.2 generates wrappers which don't compile with Py_LIMITED_API
+test.write('SConstruct', """\
+# SConstruct
+env = Environment( %(_env_args_)s )
+env.Replace(SWIGVERSION = '4.1.1')
+env.SwigPyModule('hello', SWIGPY_LIMITED_API = '3.8', srcdir = 'src')
+""" % locals())
+
+test.run(status = 2, stderr = None)
+test.must_contain_all_lines(test.stderr(), ['SWIGPY_LIMITED_API requires swig 4.2 or later, found 4.1.1'])
+
+test.pass_test()
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
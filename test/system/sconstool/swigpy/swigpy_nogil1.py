@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2014-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+__docformat__ = "restructuredText"
+
+"""
+Test declaring modules safe to run without the GIL (SWIGPY_NOGIL)
+"""
+
+import os
+import re
+from swigpytest import swigpy_test, _env_args_, _swigpy_python_, _ext
+
+test = swigpy_test()
+
+_swig_version = re.search(r'SWIG Version (\d+)\.(\d+)', os.popen('swig -version').read())
+if not _swig_version or tuple(int(x) for x in _swig_version.groups()) < (4, 3):
+    test.skip_test("SWIGPY_NOGIL requires swig 4.3 or later, skipping test\n")
+
+_gil_disabled = os.popen('%s -c "import sysconfig; print(bool(sysconfig.get_config_var(\'Py_GIL_DISABLED\')))"'
+                         % _swigpy_python_).read().strip() == 'True'
+
+test.subdir(['src'])
+
+test.write('SConstruct', """\
+# SConstruct
+import os
+env = Environment( %(_env_args_)s )
+SConscript('src/SConscript', exports=['env'], variant_dir='build', duplicate=0)
+""" % locals())
+
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+env.SwigPyModule('hello', SWIGPY_NOGIL = True, SWIGPY_CCFLAGS = ['-DHELLO_INCREMENT=1'])
+""")
+
+test.write('src/hello.i', """\
+// src/hello.i
+%module hello
+%inline %{
+int hello(int x) { return x + HELLO_INCREMENT; }
+%}
+""")
+
+test.run()
+
+test.must_exist('build/_hello%(_ext)s' % locals())
+lines = test.stdout().splitlines()
+swig = [l.split() for l in lines if l.endswith('hello.i')]
+compile = [l.split() for l in lines if ' -c ' in l and 'hello_wrap' in l]
+test.fail_test(len(swig) != 1 or len(compile) != 1)
+test.fail_test('-nogil' not in swig[0])
+test.fail_test(not [f for f in compile[0] if f.endswith('SWIGPY_NOGIL')])
+
+test.up_to_date(arguments = '.')
+
+# with a free-threaded interpreter, importing the module doesn't enable the GIL
+test.write('build/test.py', """\
+#!%(_swigpy_python_)s
+import sys
+import hello
+print(hello.hello(1))
+if %(_gil_disabled)r:
+    print(sys._is_gil_enabled())
+""" % locals())
+
+os.environ['PYTHONPATH'] = test.workpath('build')
+test.run(chdir='build', program='test.py', interpreter=_swigpy_python_,
+         stdout='2\n' + ('False\n' if _gil_disabled else ''), stderr=None)
+
+
+test.pass_test()
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2014-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+__docformat__ = "restructuredText"
+
+"""
+Test optimization profiles overridden per call (SWIGPY_OPTIMIZE)
+"""
+
+import sys
+import os
+from swigpytest import swigpy_test, _env_args_, _swigpy_python_, _ext
+
+test = swigpy_test()
+
+if sys.platform == 'win32':
+    test.skip_test("SWIGPY_OPTIMIZE is not supported by MSVC, skipping test\n")
+
+test.subdir(['src'])
+
+test.write('SConstruct', """\
+# SConstruct
+import os
+env = Environment( %(_env_args_)s )
+SConscript('src/SConscript', exports=['env'], variant_dir='build', duplicate=0)
+""" % locals())
+
+# overriding SWIGPY_CCFLAGS in the call must not drop the flags of the profile
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+env.SwigPyModule('hello', SWIGPY_OPTIMIZE = 'speed', SWIGPY_CCFLAGS = ['-DHELLO_INCREMENT=2'])
+""")
+
+test.write('src/hello.i', """\
+// src/hello.i
+%module hello
+%inline %{
+int hello(int x) { return x + HELLO_INCREMENT; }
+%}
+""")
+
+test.run()
+
+test.must_exist('build/_hello%(_ext)s' % locals())
+shlib = '_hello' + _ext
+lines = test.stdout().splitlines()
+compile = [l for l in lines if ' -c ' in l and 'hello_wrap' in l]
+link = [l for l in lines if shlib in l]
+test.fail_test(len(compile) != 1 or len(link) != 1)
+for flag in ['-DHELLO_INCREMENT=2', '-O3', '-flto', '-fvisibility=hidden']:
+    test.fail_test(flag not in compile[0].split())
+test.fail_test('-flto' not in link[0].split())
+
+test.up_to_date(arguments = '.')
+
+test.write('build/test.py', """\
+#!%(_swigpy_python_)s
+import hello
+print(hello.hello(1))
+""" % locals())
+
+os.environ['PYTHONPATH'] = test.workpath('build')
+test.run(chdir='build', program='test.py', interpreter=_swigpy_python_, stdout='3\n', stderr=None)
+
+
+test.pass_test()
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
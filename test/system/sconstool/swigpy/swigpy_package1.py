@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2014-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+__docformat__ = "restructuredText"
+
+"""
+Test discovering modules in a directory tree (SwigPyPackage)
+"""
+
+import os
+from swigpytest import swigpy_test, _env_args_, _swigpy_python_, _ext
+
+test = swigpy_test()
+
+test.subdir(['src'])
+
+test.write('SConstruct', """\
+# SConstruct
+import os
+env = Environment( %(_env_args_)s, SWIGPY_PACKAGE_INDEX = '#.swigpy_index.json' )
+SConscript('src/SConscript', exports=['env'], variant_dir='build', duplicate=0)
+""" % locals())
+
+test.subdir(['src', 'foo'], ['src', 'foo', 'bar'])
+
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+env.SwigPyPackage('.')
+""")
+
+test.write('src/foo/a.i', """\
+// src/foo/a.i
+%module a
+%include "consts.i"
+%inline %{
+int get_a(void) { return A; }
+%}
+""")
+
+test.write('src/foo/consts.i', """\
+// src/foo/consts.i
+%{
+#define A 1
+%}
+""")
+
+test.write('src/foo/c.i', """\
+// src/foo/c.i (not a module yet)
+""")
+
+test.write('src/foo/bar/b.i', """\
+// src/foo/bar/b.i
+%module b
+%inline %{
+int get_b(void) { return 2; }
+%}
+""")
+
+test.run()
+
+test.must_exist('build/foo/a_wrap.c')
+test.must_exist('build/foo/bar/b_wrap.c')
+test.must_not_exist('build/foo/consts_wrap.c')
+test.must_not_exist('build/foo/c_wrap.c')
+test.must_exist('.swigpy_index.json')
+test.must_exist('build/foo/__init__.py')
+test.must_exist('build/foo/bar/__init__.py')
+test.must_exist('build/foo/_a%(_ext)s' % locals())
+test.must_exist('build/foo/bar/_b%(_ext)s' % locals())
+
+test.write('build/test.py', """\
+#!%(_swigpy_python_)s
+import foo.a, foo.bar.b
+print('%%d %%d' %% (foo.a.get_a(), foo.bar.b.get_b()))
+""" % locals())
+
+os.environ['PYTHONPATH'] = test.workpath('build')
+test.run(chdir='build', program='test.py', interpreter=_swigpy_python_, stdout='1 2\n', stderr=None)
+
+test.up_to_date(arguments = '.')
+
+# turning an interface into a module in place doesn't touch its directory
+test.write('src/foo/c.i', """\
+// src/foo/c.i
+%module c
+%inline %{
+int get_c(void) { return 3; }
+%}
+""")
+
+test.run()
+
+test.must_exist('build/foo/c_wrap.c')
+test.must_exist('build/foo/_c%(_ext)s' % locals())
+
+
+test.pass_test()
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2014-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+__docformat__ = "restructuredText"
+
+"""
+Test compiling the wrappers with a precompiled header (SWIGPY_PCH)
+"""
+
+import sys
+import os
+from swigpytest import swigpy_test, _env_args_, _swigpy_python_, _ext
+
+test = swigpy_test()
+
+if sys.platform == 'win32':
+    test.skip_test("SWIGPY_PCH is not supported by MSVC, skipping test\n")
+
+test.subdir(['src'])
+
+test.write('SConstruct', """\
+# SConstruct
+import os
+env = Environment( %(_env_args_)s, SWIGPY_PCH = True, SWIGPY_PCHDIR = '#build/pch' )
+if 'clang' in env.subst('$CC'):
+    env['SWIGPY_PCHSUFFIX'] = '.pch'
+SConscript('src/SConscript', exports=['env'], variant_dir='build', duplicate=0)
+""" % locals())
+
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+env.SwigPyModule(['foo', 'bar'])
+""")
+
+for name in ('foo', 'bar'):
+    test.write('src/%s.i' % name, """\
+// src/%(name)s.i
+%%module %(name)s
+%%inline %%{
+int %(name)s(int x) { return x + 1; }
+%%}
+""" % locals())
+
+test.run()
+
+test.must_exist('build/_foo%(_ext)s' % locals())
+test.must_exist('build/_bar%(_ext)s' % locals())
+# both the wrappers share one precompiled header
+lines = test.stdout().splitlines()
+pch = [l for l in lines if '-x c-header' in l]
+test.fail_test(len(pch) != 1)
+header = [f for f in os.listdir(test.workpath('build/pch')) if f.endswith('.h')]
+test.fail_test(len(header) != 1)
+for name in ('foo', 'bar'):
+    compile = [l for l in lines if ' -c ' in l and '%s_wrap' % name in l]
+    test.fail_test(len(compile) != 1)
+    test.fail_test('-include' not in compile[0].split() or '-Winvalid-pch' not in compile[0].split())
+    test.fail_test(header[0] not in compile[0])
+
+test.up_to_date(arguments = '.')
+
+test.write('build/test.py', """\
+#!%(_swigpy_python_)s
+import foo, bar
+print(foo.foo(1) + bar.bar(1))
+""" % locals())
+
+os.environ['PYTHONPATH'] = test.workpath('build')
+test.run(chdir='build', program='test.py', interpreter=_swigpy_python_, stdout='4\n', stderr=None)
+
+
+test.pass_test()
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
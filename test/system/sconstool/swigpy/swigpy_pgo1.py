@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2014-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+__docformat__ = "restructuredText"
+
+"""
+Test profile-guided optimization with GCC (SWIGPY_PGO)
+"""
+
+import sys
+import os
+import TestCmd
+from swigpytest import swigpy_test, _env_args_, _swigpy_python_, _ext
+
+test = swigpy_test()
+
+if sys.platform in ('win32', 'darwin') or not TestCmd.where_is('gcc') or not TestCmd.where_is('objcopy'):
+    test.skip_test("gcc or objcopy not available, skipping test\n")
+
+test.subdir(['src'])
+
+# with the debug info split off, the instrumented extension has two targets
+test.write('SConstruct', """\
+# SConstruct
+import os
+env = Environment( %(_env_args_)s, CC = 'gcc', SWIGPY_DEBUGINFO = 'split' )
+env.Append( SWIGPY_CCFLAGS = ['-g'] )
+SConscript('src/SConscript', exports=['env'], variant_dir='build', duplicate=0)
+""" % locals())
+
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+env.SwigPyModule('hello', SWIGPY_PGO = 'train.py')
+""")
+
+test.write('src/hello.i', """\
+// src/hello.i
+%module hello
+%inline %{
+int hello(int x) { return x % 3 ? x + 1 : x - 1; }
+%}
+""")
+
+test.write('src/train.py', """\
+import hello
+for i in range(1000):
+    hello.hello(i)
+""")
+
+test.run()
+
+test.must_exist('build/pgo/_hello%(_ext)s' % locals())
+test.must_exist('build/pgo/hello_wrap.gcda')
+test.must_exist('build/hello_wrap.gcda')
+test.must_exist('build/_hello%(_ext)s' % locals())
+lines = test.stdout().splitlines()
+test.fail_test(not [l for l in lines if ' -c ' in l and 'pgo/hello_wrap' in l and '-fprofile-generate' in l])
+test.fail_test(not [l for l in lines if ' -c ' in l and 'pgo/hello_wrap' not in l and '-fprofile-use' in l])
+
+test.up_to_date(arguments = '.')
+
+test.write('build/test.py', """\
+#!%(_swigpy_python_)s
+import hello
+print(hello.hello(1))
+""" % locals())
+
+os.environ['PYTHONPATH'] = test.workpath('build')
+test.run(chdir='build', program='test.py', interpreter=_swigpy_python_, stdout='2\n', stderr=None)
+
+
+test.pass_test()
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
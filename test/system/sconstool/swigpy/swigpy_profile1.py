@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2014-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+__docformat__ = "restructuredText"
+
+"""
+Test build-time profile of swig modules (SWIGPY_PROFILE)
+"""
+
+from swigpytest import swigpy_test, _python_, _env_args_
+
+test = swigpy_test()
+
+test.subdir(['src'])
+
+test.write('SConstruct', """\
+# SConstruct
+import os
+env = Environment( %(_env_args_)s, SWIGPY_PROFILE = '#profile.json' )
+SConscript('src/SConscript', exports=['env'], variant_dir='build', duplicate=0)
+""" % locals())
+
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+env.SwigPyModule('calc')
+""")
+
+test.write('src/calc.i', """\
+// src/calc.i
+%module calc
+%inline %{
+int add(int a, int b) { return a + b; }
+%}
+""")
+
+test.run(arguments = ['-j2'])
+
+test.must_exist('profile.json')
+test.must_exist('profile.csv')
+test.must_exist('profile.trace.json')
+
+test.write('check.py', """\
+import json
+report = json.load(open('profile.json'))
+print(sorted(r['phase'] for r in report['records']))
+print([r['phase'] for r in report['critical_path']])
+print(report['modules'][0]['module'])
+trace = json.load(open('profile.trace.json'))
+print(len([e for e in trace['traceEvents'] if e['ph'] == 'X']))
+""")
+test.run(program='check.py', interpreter=_python_,
+         stdout="['compile', 'link', 'swig']\n['swig', 'compile', 'link']\nbuild/calc\n3\n")
+
+# The profile doesn't change signatures, and a null build keeps the report.
+test.write('SConstruct', """\
+# SConstruct
+import os
+env = Environment( %(_env_args_)s )
+SConscript('src/SConscript', exports=['env'], variant_dir='build', duplicate=0)
+""" % locals())
+test.up_to_date(arguments = '.')
+test.must_exist('profile.json')
+
+
+test.pass_test()
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2014-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+__docformat__ = "restructuredText"
+
+"""
+Test building a module for a list of interpreters (SWIGPY_PYTHONS)
+"""
+
+import sys
+import os
+from swigpytest import swigpy_test, _env_args_, _swigpy_python_, _ext
+
+test = swigpy_test()
+
+test.subdir(['src'])
+
+test.write('SConstruct', """\
+# SConstruct
+import os
+env = Environment( %(_env_args_)s )
+SConscript('src/SConscript', exports=['env'], variant_dir='build', duplicate=0)
+""" % locals())
+
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+env.Append( SWIGPY_CPPPATH = ['.'] )
+env.Append( SWIGPY_LIBPATH = ['.'] )
+env.Append( SWIGPY_SWIGFLAGS = ['-c++'] )
+env.SharedLibrary('hello', ['hello.cpp'], CPPDEFINES={'BUILDING_HELLO': '1'})
+env.SwigPyModule('hello', SWIGPY_LIBS = ['$SWIGPY_PYTHONLIB', 'hello'],
+                 SWIGPY_PYTHONS = [r'%(_swigpy_python_)s'],
+                 SWIGPY_PYTHONVARIANTDIR = 'py')
+""" % locals())
+
+test.write('src/hello.hpp', """\
+// src/hello.hpp
+#ifndef HELLO_HPP
+#define HELLO_HPP
+#ifdef _WIN32
+# ifdef BUILDING_HELLO
+#  define HELLO_API __declspec(dllexport)
+# else
+#  define HELLO_API __declspec(dllimport)
+# endif
+#else
+# define HELLO_API
+#endif
+extern void HELLO_API hello();
+#endif
+""" % locals())
+
+test.write('src/hello.cpp', """\
+// src/hello.cpp
+#include "hello.hpp"
+#include <iostream>
+void HELLO_API hello() { std::cout << "Hello" << std::endl; }
+""")
+
+test.write('src/hello.i', """\
+// src/hello.i
+%%module hello
+%%{
+#include "hello.hpp"
+%%}
+#define HELLO_API
+%%include "hello.hpp"
+""" % locals())
+
+test.run()
+
+test.must_exist('build/hello_wrap.cc')
+test.must_exist('build/hello.py')
+test.must_exist('build/py/_hello%(_ext)s' % locals())
+test.must_not_exist('build/_hello%(_ext)s' % locals())
+
+test.write('build/test.py', """\
+#!%(_swigpy_python_)s
+import hello
+hello.hello()
+""" % locals())
+
+_pythonpath_ = os.path.pathsep.join([test.workpath('build'), test.workpath('build', 'py')])
+if sys.platform == 'win32':
+    os.environ['PATH'] = os.path.pathsep.join([test.workpath('build'), os.environ['PATH']])
+else:
+    os.environ['LD_LIBRARY_PATH'] = test.workpath('build')
+os.environ['PYTHONPATH'] = _pythonpath_
+test.run(chdir='build', program='test.py', interpreter=_swigpy_python_, stdout='Hello\n', stderr=None)
+
+
+test.pass_test()
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2014-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+__docformat__ = "restructuredText"
+
+"""
+Test dependencies of interfaces recorded by swig (SWIGPY_SWIGDEPDB)
+"""
+
+import os
+import json
+from swigpytest import swigpy_test, _env_args_, _ext
+
+test = swigpy_test()
+
+test.subdir(['src'])
+
+test.write('SConstruct', """\
+# SConstruct
+import os
+env = Environment( %(_env_args_)s, SWIGPY_SWIGDEPDB = '#.swigpy_deps.json' )
+env.Append( SWIGPY_SWIGPATH = ['#src'] )
+SConscript('src/SConscript', exports=['env'], variant_dir='build', duplicate=0)
+""" % locals())
+
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+env.SwigPyModule('hello')
+""")
+
+test.write('src/hello.i', """\
+// src/hello.i
+%module hello
+%include "consts.i"
+%inline %{
+int hello(int x) { return x + ONE; }
+%}
+""")
+
+test.write('src/consts.i', """\
+// src/consts.i
+%{
+#define ONE 1
+%}
+""")
+
+test.write('src/more.i', """\
+// src/more.i
+""")
+
+def recorded_deps():
+    deps = json.loads(test.read('.swigpy_deps.json', mode='r'))
+    return sorted(os.path.basename(dep) for entry in deps.values() for dep in entry)
+
+test.run()
+
+test.must_exist('build/_hello%(_ext)s' % locals())
+test.must_not_exist('build/hello_wrap.c.d')
+test.fail_test('consts.i' not in recorded_deps())
+
+test.up_to_date(arguments = '.')
+
+# %including a new file regenerates the wrapper and records the new dependency
+test.write('src/consts.i', """\
+// src/consts.i
+%include "more.i"
+%{
+#define ONE 1
+%}
+""")
+test.run()
+test.fail_test('hello.i' not in test.stdout())
+test.fail_test('more.i' not in recorded_deps())
+
+# which is then tracked through the database
+test.write('src/more.i', """\
+// src/more.i
+%constant int TWO = 2;
+""")
+test.run()
+test.fail_test('hello.i' not in test.stdout())
+
+test.up_to_date(arguments = '.')
+
+
+test.pass_test()
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2014-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+__docformat__ = "restructuredText"
+
+"""
+Test releasing GIL in wrappers (SWIGPY_THREADS, SWIGPY_NOTHREAD)
+"""
+
+import os
+from swigpytest import swigpy_test, _env_args_, _swigpy_python_, _ext
+
+test = swigpy_test()
+
+test.subdir(['src'])
+
+test.write('SConstruct', """\
+# SConstruct
+import os
+env = Environment( %(_env_args_)s, SWIGPY_THREADS = True )
+SConscript('src/SConscript', exports=['env'], variant_dir='build', duplicate=0)
+""" % locals())
+
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+env.SwigPyModule('work', SWIGPY_NOTHREAD = ['wait_flag_locked'])
+# interface and wrapper files named other than the module
+env.SwigPyModule('tick', SWIGPY_NOTHREAD = ['tick'],
+                 SWIGPY_M2SWIGFILE = lambda parts: 'ticker.i',
+                 SWIGPY_M2CFILE = lambda parts: 'ticker')
+""")
+
+test.write('src/ticker.i', """\
+// src/ticker.i
+%module tick
+%inline %{
+int tick(int x) { return x + 1; }
+%}
+""")
+
+test.write('src/work.i', """\
+// src/work.i
+%module work
+%{
+#ifdef _WIN32
+# include <windows.h>
+static void pause_ms(int ms) { Sleep(ms); }
+#else
+# include <unistd.h>
+static void pause_ms(int ms) { usleep(1000 * ms); }
+#endif
+static volatile int started = 0;
+static volatile int flag = 0;
+static int wait_for_flag(int timeout_ms) {
+  int ms;
+  started = 1;
+  for (ms = 0; ms < timeout_ms && !flag; ms++)
+    pause_ms(1);
+  return flag;
+}
+%}
+%inline %{
+void reset(void) { started = 0; flag = 0; }
+int is_started(void) { return started; }
+void set_flag(void) { flag = 1; }
+int wait_flag(int timeout_ms) { return wait_for_flag(timeout_ms); }
+int wait_flag_locked(int timeout_ms) { return wait_for_flag(timeout_ms); }
+%}
+""")
+
+test.run()
+
+test.must_exist('build/swigpy_nothread/work.i')
+test.must_exist('build/work_wrap.c')
+test.must_exist('build/work.py')
+test.must_exist('build/_work%(_ext)s' % locals())
+test.must_exist('build/swigpy_nothread/tick.i')
+test.must_exist('build/ticker_wrap.c')
+test.must_exist('build/tick.py')
+test.must_exist('build/_tick%(_ext)s' % locals())
+
+test.up_to_date(arguments = '.')
+
+# A thread waits in C code for a flag, which the main thread sets once the
+# wait started. The main thread gets to set it only if the wrapper released
+# the GIL, otherwise the wait times out. Without the GIL (free-threaded
+# python) the calls to wait_flag_locked() run concurrently as well.
+test.write('build/test.py', """\
+#!%(_swigpy_python_)s
+import sys
+import threading
+import time
+import tick
+import work
+
+def concurrent(wait, timeout_ms):
+    work.reset()
+    result = []
+    thread = threading.Thread(target=lambda: result.append(wait(timeout_ms)))
+    thread.start()
+    while not work.is_started():
+        time.sleep(0.001)
+    work.set_flag()
+    thread.join()
+    return bool(result[0])
+
+gil_disabled = not getattr(sys, '_is_gil_enabled', lambda: True)()
+print(concurrent(work.wait_flag, 60000))
+print(concurrent(work.wait_flag_locked, 200) == gil_disabled)
+print(tick.tick(1))
+""" % locals())
+
+os.environ['PYTHONPATH'] = test.workpath('build')
+test.run(chdir='build', program='test.py', interpreter=_swigpy_python_, stdout='True\nTrue\n2\n', stderr=None)
+
+
+test.pass_test()
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2014-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+__docformat__ = "restructuredText"
+
+"""
+Test bundling several swig modules in a single extension (SwigPyUnity)
+"""
+
+import os
+from swigpytest import swigpy_test, _env_args_, _swigpy_python_, _ext
+
+test = swigpy_test()
+
+test.subdir(['src'])
+
+test.write('SConstruct', """\
+# SConstruct
+import os
+env = Environment( %(_env_args_)s )
+SConscript('src/SConscript', exports=['env'], variant_dir='build', duplicate=0)
+""" % locals())
+
+test.subdir(['src', 'calc'])
+
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+env.SwigPyUnity('calc.all', ['calc.add', 'calc.mul'])
+""")
+
+test.write('src/calc/__init__.py', "")
+
+test.write('src/calc/add.i', """\
+// src/calc/add.i
+%module add
+%inline %{
+int add(int a, int b) { return a + b; }
+%}
+""")
+
+test.write('src/calc/mul.i', """\
+// src/calc/mul.i
+%module mul
+%inline %{
+int mul(int a, int b) { return a * b; }
+%}
+""")
+
+test.run()
+
+test.must_exist('build/calc/add_wrap.c')
+test.must_exist('build/calc/mul_wrap.c')
+test.must_exist('build/calc/all_init.c')
+test.must_exist('build/calc/add.py')
+test.must_exist('build/calc/mul.py')
+test.must_exist('build/calc/_add.py')
+test.must_exist('build/calc/_mul.py')
+test.must_exist('build/calc/_all%(_ext)s' % locals())
+test.must_not_exist('build/calc/_add%(_ext)s' % locals())
+test.must_not_exist('build/calc/_mul%(_ext)s' % locals())
+
+test.write('build/calc/__init__.py', "")
+test.write('build/test.py', """\
+#!%(_swigpy_python_)s
+import calc.add, calc.mul
+print('%%d %%d' %% (calc.add.add(2, 3), calc.mul.mul(2, 3)))
+""" % locals())
+
+os.environ['PYTHONPATH'] = test.workpath('build')
+test.run(chdir='build', program='test.py', interpreter=_swigpy_python_, stdout='5 6\n', stderr=None)
+
+
+test.pass_test()
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
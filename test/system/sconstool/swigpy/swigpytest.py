@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2014-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+__docformat__ = "restructuredText"
+
+"""
+Common setup of the swigpy system tests (not a test itself)
+"""
+
+import sys
+import os
+import glob
+import sysconfig
+import TestSCons
+import TestCmd
+
+_dll = TestSCons._dll
+dll_ = TestSCons.dll_
+_python_ = TestSCons._python_
+
+# the tool consists of all the python modules found in the top source directory
+_fixture_dir_ = os.path.join(os.pardir, os.pardir, os.pardir, os.pardir)
+_topsrcdir_ = os.path.join(os.path.dirname(os.path.abspath(__file__)), _fixture_dir_)
+_tool_files_ = sorted(os.path.basename(f) for f in glob.glob(os.path.join(_topsrcdir_, '*.py'))
+                      if os.path.basename(f) != 'setup.py')
+
+
+if sysconfig.get_platform().startswith('mingw'):
+    # Set 'mingw' tool, because 'default' prefers MS Visual C Compiler
+    _tools_ = r"['mingw', 'swigpy']"
+else:
+    _tools_ = r"['default', 'swigpy']"
+
+_path_ = os.environ['PATH']
+if sys.platform == 'win32':
+    _env_args_ = "tools=%(_tools_)s, ENV={'TEMP':'.', 'PATH': r%(_path_)r}" % locals()
+else:
+    _env_args_ = "tools=%(_tools_)s" % locals()
+
+# support compiling and testing against custom python interpreter (other than the one running this script).
+
+_swigpy_python_ = os.environ.get('SWIGPY_PYTHON', _python_)
+
+# extension suffix of the interpreter the modules are built for (EXT_SUFFIX)
+_ext = os.popen('%s -c "import sysconfig; print(sysconfig.get_config_var(\'EXT_SUFFIX\') '
+                'or sysconfig.get_config_var(\'SO\'))"' % _swigpy_python_).read().strip()
+
+try:
+    _swigpy_pyconf_ = os.environ['SWIGPY_PYCONF']
+except KeyError:
+    _swigpy_pyconf_ = None
+
+if _swigpy_pyconf_ is not None:
+    _env_args_ = _env_args_ + ', **%(_swigpy_pyconf_)s' % locals()
+elif _swigpy_python_ != _python_:
+    _env_args_ = _env_args_ + ', SWIGPY_PYTHON=r%(_swigpy_python_)r' % locals()
+
+
+def swigpy_test():
+    _scons_ = TestCmd.where_is('scons')
+    if _scons_ is not None:
+        # Find the actual scons Python script. We believe that the scons found
+        # withing PATH is the one installed for our _python_.
+        if _scons_[-4:].upper() in ['.BAT']:
+            # On win32 the python script is found alongside with the .BAT script.
+            # where_is() returns 'scons.BAT', so we need to strip out the extension.
+            _scons_ = _scons_[:-4]
+        test = TestSCons.TestSCons(program=_scons_, interpreter=_python_)
+    else:
+        test = TestSCons.TestSCons(interpreter=_python_)
+
+    test.subdir(['site_scons'])
+    test.subdir(['site_scons', 'site_tools'])
+    test.subdir(['site_scons', 'site_tools', 'swigpy'])
+    for name in _tool_files_:
+        test.file_fixture(os.path.join(_fixture_dir_, name), os.path.join('site_scons', 'site_tools', 'swigpy', name))
+    return test
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4: